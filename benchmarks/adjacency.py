@@ -0,0 +1,139 @@
+"""Neighbour queries on the adjacency graph against testing every piece.
+
+First checks that the graph agrees with testing every pair of pieces after
+random cuts, copies and rollbacks of the cakes in cakes/. Then times the
+queries on a square cake cut into a grid of cells, so each piece has a
+handful of neighbours however many pieces there are. Run from the
+repository root:
+
+    uv run python -m benchmarks.adjacency
+"""
+
+import random
+from glob import glob
+from time import perf_counter
+
+from shapely import Point, Polygon
+
+import src.constants as c
+from src.cake import Cake, InvalidCakeException, read_cake
+
+CUTS = 12
+SEEDS = 3
+
+
+def grid_cake(side: int) -> Cake:
+    """A square cake cut into side x side cells."""
+    size = 4 * side
+    cake = Cake(Polygon([(0, 0), (size, 0), (size, size), (0, size)]), side, True)
+    for x in range(4, size, 4):
+        cake.cut(Point(x, 0), Point(x, size))
+    for y in range(4, size, 4):
+        for x in range(0, size, 4):
+            cake.cut(Point(x, y), Point(x + 4, y))
+    return cake
+
+
+def touching(cake: Cake, piece: Polygon) -> set[int]:
+    """The pieces touching `piece`, found by testing every other piece."""
+    return {
+        id(other)
+        for other in cake.get_pieces()
+        if other is not piece
+        and other.boundary.distance(piece.boundary) <= c.PIECE_CONTACT_TOL
+    }
+
+
+def check(cake: Cake, where: str):
+    for piece in cake.get_pieces():
+        found = {id(other) for other, _ in cake.get_piece_neighbours(piece)}
+        expected = touching(cake, piece)
+        if found != expected:
+            raise AssertionError(
+                f"{where}: graph has {len(found)} neighbours of a piece, "
+                f"{len(expected)} touch it"
+            )
+
+
+def random_cut(cake: Cake, rng: random.Random) -> bool:
+    """Cut a random piece between two random points of its boundary."""
+    piece = rng.choice(cake.get_pieces())
+    for _ in range(50):
+        a = piece.exterior.interpolate(rng.random(), normalized=True)
+        b = piece.exterior.interpolate(rng.random(), normalized=True)
+        validated, _ = cake.validate_cut(a, b)
+        if validated is not None:
+            cake.apply_cut(validated)
+            return True
+    return False
+
+
+def check_random_cuts(path: str, seed: int):
+    rng = random.Random(seed)
+    try:
+        cake = read_cake(path, CUTS + 1, True)
+    except InvalidCakeException:
+        return
+    where = f"{path} seed {seed}"
+    copies = []
+    for _ in range(CUTS):
+        # query a random piece now and then, so contacts are resolved
+        # part-way through the cuts, as players do
+        if rng.random() < 0.5:
+            cake.get_piece_neighbours(rng.choice(cake.get_pieces()))
+        if rng.random() < 0.3:
+            copies.append(cake.copy())
+        if rng.random() < 0.2:
+            savepoint = cake.savepoint()
+            random_cut(cake, rng)
+            cake.rollback(savepoint)
+        if not random_cut(cake, rng):
+            break
+    check(cake, where)
+    for i, copy in enumerate(copies):
+        random_cut(copy, rng)
+        check(copy, f"{where} copy {i}")
+    check(cake, f"{where} after copies")
+
+
+def main():
+    paths = sorted(glob("cakes/*.csv") + glob("cakes/players/*/*.csv"))
+    for path in paths:
+        for seed in range(SEEDS):
+            check_random_cuts(path, seed)
+    print("graph agrees with testing every pair on the cakes in cakes/\n")
+
+    print(f"{'pieces':>7} {'scan (ms)':>10} {'first (ms)':>11} {'again (ms)':>11}")
+    for side in (4, 8, 16):
+        cake = grid_cake(side)
+        pieces = cake.get_pieces()
+
+        start = perf_counter()
+        for piece in pieces:
+            [
+                other
+                for other in pieces
+                if other is not piece
+                and other.boundary.distance(piece.boundary) <= c.PIECE_CONTACT_TOL
+            ]
+        scan = (perf_counter() - start) / len(pieces)
+
+        # the first query computes the contacts, later ones look them up
+        start = perf_counter()
+        for piece in pieces:
+            cake.get_piece_neighbours(piece)
+        first = (perf_counter() - start) / len(pieces)
+
+        start = perf_counter()
+        for piece in pieces:
+            cake.get_piece_neighbours(piece)
+        again = (perf_counter() - start) / len(pieces)
+
+        print(
+            f"{len(pieces):>7} {scan * 1e3:>10.3f} {first * 1e3:>11.3f} "
+            f"{again * 1e3:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
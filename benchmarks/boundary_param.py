@@ -0,0 +1,78 @@
+"""Cached boundary parametrization against shapely's interpolate and project.
+
+Snapping is what every cut validation does to both endpoints, sampling is
+what players do to pick candidate endpoints. Building the parametrization
+is timed separately: pieces snapped to only a few times are left to
+shapely. Run from the repository root:
+
+    uv run python -m benchmarks.boundary_param
+"""
+
+import random
+from time import perf_counter
+
+import numpy as np
+from shapely import Point
+
+from src.boundary import BoundaryParam
+from src.cake import read_cake
+
+CAKES = [
+    "cakes/players/player1/star.csv",
+    "cakes/players/player1/cat.csv",
+    "cakes/players/player8/koch_snowflake_order3.csv",
+    "cakes/players/player9/minkowski.csv",
+]
+
+SAMPLES = 2000
+
+
+def main():
+    rng = random.Random(0)
+    print(
+        f"{'cake':>48} {'edges':>6} {'snap (us)':>10} {'build (us)':>11} "
+        f"{'cached (us)':>12} {'sample (ms)':>12} {'cached (ms)':>12}"
+    )
+    for path in CAKES:
+        piece = read_cake(path, 10, True).exterior_shape
+        bound = piece.boundary
+        param = BoundaryParam(piece)
+        minx, miny, maxx, maxy = piece.bounds
+        points = [
+            (rng.uniform(minx, maxx), rng.uniform(miny, maxy)) for _ in range(SAMPLES)
+        ]
+
+        start = perf_counter()
+        for x, y in points:
+            bound.interpolate(bound.project(Point(x, y)))
+        snap = (perf_counter() - start) / SAMPLES
+
+        start = perf_counter()
+        for x, y in points[:100]:
+            BoundaryParam(piece).project(x, y)
+        build = (perf_counter() - start) / 100
+
+        param.project(*points[0])
+        start = perf_counter()
+        for x, y in points:
+            param.snap(x, y)
+        cached = (perf_counter() - start) / SAMPLES
+
+        step = bound.length / SAMPLES
+        start = perf_counter()
+        [bound.interpolate(i * step) for i in range(SAMPLES)]
+        sample = perf_counter() - start
+
+        start = perf_counter()
+        param.interpolate_many(np.arange(SAMPLES) * step)
+        sample_cached = perf_counter() - start
+
+        print(
+            f"{path:>48} {len(piece.exterior.coords) - 1:>6} {snap * 1e6:>10.1f} "
+            f"{build * 1e6:>11.1f} {cached * 1e6:>12.1f} {sample * 1e3:>12.2f} "
+            f"{sample_cached * 1e3:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
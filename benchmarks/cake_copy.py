@@ -0,0 +1,56 @@
+"""Cost of `Cake.copy` as the number of cake vertices grows.
+
+Compares the structural-sharing copy against the previous WKB round-trip.
+Run from the repository root:
+
+    uv run python -m benchmarks.cake_copy
+"""
+
+from math import cos, pi, sin
+from time import perf_counter
+
+from shapely import LineString, Polygon
+
+from src.cake import Cake, copy_geom
+
+
+def round_cake(vertices: int) -> Cake:
+    """A circular cake approximated by `vertices` points, cut into 8 pieces."""
+    ring = [
+        (20 + 20 * cos(2 * pi * i / vertices), 20 + 20 * sin(2 * pi * i / vertices))
+        for i in range(vertices)
+    ]
+    cake = Cake(Polygon(ring), 8, True)
+    for x in range(5, 40, 5):
+        chord = LineString([(x, -1), (x, 41)])
+        a, b = chord.intersection(cake.exterior_shape.boundary).geoms
+        cake.cut(a, b)
+    return cake
+
+
+def wkb_copy(cake: Cake) -> Cake:
+    new = object.__new__(Cake)
+    new.exterior_shape = copy_geom(cake.exterior_shape)
+    new.interior_shape = copy_geom(cake.interior_shape)
+    new.exterior_pieces = [copy_geom(p) for p in cake.exterior_pieces]
+    return new
+
+
+def time_copies(copy, cake: Cake, repeat: int = 200) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        copy(cake)
+    return (perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'vertices':>9} {'wkb (us)':>10} {'shared (us)':>12}")
+    for vertices in (32, 256, 2048, 16384):
+        cake = round_cake(vertices)
+        old = time_copies(wkb_copy, cake)
+        new = time_copies(Cake.copy, cake)
+        print(f"{vertices:>9} {old * 1e6:>10.1f} {new * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Greedy cutting with candidates kept across cuts against rescoring them all.
+
+Every piece big enough for several children gets candidate chords from
+`ChordAreas`, scored by how close they come to halving it in whole
+children. The greedy loop repeatedly takes the best candidate over all
+pieces. Rebuilding regenerates the candidates
+of every piece after each cut, the store only those of the two new pieces.
+Both must make the same cuts. Run from the repository root:
+
+    uv run python -m benchmarks.candidate_store
+"""
+
+from time import perf_counter
+
+from shapely import Polygon
+
+from src.cake import read_cake
+from src.candidates import CandidateStore
+from src.chords import ChordAreas
+
+CAKES = [
+    "cakes/rectangle.csv",
+    "cakes/players/player1/star.csv",
+    "cakes/players/player1/cat.csv",
+]
+CHILDREN = 16
+SAMPLES = 200
+
+
+def candidate_cuts(size: float):
+    def generate(piece: Polygon):
+        children = round(piece.area / size)
+        if children < 2:
+            return []
+        target = children // 2 * size
+        chords = ChordAreas(piece, SAMPLES)
+        return [
+            (abs(chords.areas[i, j] - target) / target, chords.endpoints(i, j))
+            for i, j in chords.closest(target, 8)
+        ]
+
+    return generate
+
+
+def greedy(path: str, incremental: bool):
+    cake = read_cake(path, CHILDREN, True)
+    generate = candidate_cuts(cake.get_area() / CHILDREN)
+    cuts = []
+
+    store = CandidateStore(generate)
+    for _ in range(CHILDREN - 1):
+        if not incremental:
+            store = CandidateStore(generate)
+        store.refresh(cake.get_pieces())
+
+        while (best := store.best()) is not None:
+            validated, _ = cake.validate_cut(*best.cut)
+            if validated is not None:
+                break
+            store.pop()
+        if best is None:
+            break
+
+        cake.apply_cut(validated)
+        cuts.append(best.cut)
+    return cuts
+
+
+def main():
+    print(f"{'cake':>40} {'rebuild (ms)':>13} {'store (ms)':>11} {'same cuts':>10}")
+    for path in CAKES:
+        start = perf_counter()
+        expected = greedy(path, incremental=False)
+        slow = perf_counter() - start
+
+        start = perf_counter()
+        got = greedy(path, incremental=True)
+        fast = perf_counter() - start
+
+        same = [(a.wkt, b.wkt) for a, b in got] == [(a.wkt, b.wkt) for a, b in expected]
+        print(f"{path:>40} {slow * 1e3:>13.1f} {fast * 1e3:>11.1f} {same!s:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Prefix-sum chord evaluator against splitting every pair of boundary samples.
+
+The split-based loop is what players run per cut: sample `K` points along
+the piece boundary, split along every pair and keep the areas and crust
+ratios of valid cuts. Run from the repository root:
+
+    uv run python -m benchmarks.chord_areas
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from src.cake import read_cake
+from src.chords import ChordAreas
+
+CAKES = [
+    "cakes/rectangle.csv",
+    "cakes/players/player1/star.csv",
+    "cakes/players/player1/cat.csv",
+]
+
+
+def main():
+    print(
+        f"{'cake':>40} {'K':>4} {'split (ms)':>11} {'chords (ms)':>12} "
+        f"{'K=500 (ms)':>11} {'max err':>9} {'missed':>7}"
+    )
+    for path in CAKES:
+        cake = read_cake(path, 10, True)
+        piece = cake.exterior_shape
+        samples = 48
+
+        start = perf_counter()
+        chords = ChordAreas(piece, samples, cake.interior_shape)
+        pairs = np.argwhere(np.triu(chords.valid))
+        interior = dict(zip(map(tuple, pairs), chords.interior_areas(pairs)))
+        fast = perf_counter() - start
+
+        err, missed = 0.0, 0
+        start = perf_counter()
+        for i in range(samples):
+            for j in range(i + 1, samples):
+                a, b = chords.endpoints(i, j)
+                validated, _ = cake.validate_cut(a, b)
+                if validated is None:
+                    continue
+                # the part on the side of areas[i, j]
+                part = min(
+                    validated.pieces, key=lambda p: abs(p.area - chords.areas[i, j])
+                )
+                inner = part.intersection(cake.interior_shape).area
+                if not chords.valid[i, j]:
+                    missed += 1
+                    continue
+                err = max(
+                    err,
+                    abs(part.area - chords.areas[i, j]),
+                    abs(inner - interior[i, j]),
+                )
+        slow = perf_counter() - start
+
+        start = perf_counter()
+        ChordAreas(piece, 500, cake.interior_shape)
+        large = perf_counter() - start
+
+        print(
+            f"{path:>40} {samples:>4} {slow * 1e3:>11.1f} {fast * 1e3:>12.1f} "
+            f"{large * 1e3:>11.1f} {err:>9.1e} {missed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
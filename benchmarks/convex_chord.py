@@ -0,0 +1,90 @@
+"""Convex fast path against shapely's predicates, as convex pieces grow.
+
+Compares deciding whether a cut goes cleanly through a convex piece: the
+shapely touches/crosses predicates, looking for a proper crossing in the
+piece's edge index, and binary-searching both crossings. The edge index and
+the chord fall back to the predicates where they find nothing, as in cut
+validation. "build" is what checking the piece's convexity costs, once per
+piece. `CONVEX_MIN_VERTICES` is set where "chord" overtakes "edges". Run
+from the repository root:
+
+    uv run python -m benchmarks.convex_chord
+"""
+
+import random
+from math import cos, pi, sin
+from time import perf_counter
+
+from shapely import LineString, Polygon
+
+from src.cake import extend_line
+from src.convex import ConvexPiece
+from src.edge_index import EdgeIndex
+
+CUTS = 500
+
+
+def main():
+    rng = random.Random(0)
+    print(
+        f"{'vertices':>9} {'build (us)':>11} {'predicates (us)':>16} "
+        f"{'edges (us)':>11} {'chord (us)':>11} {'fast path':>10}"
+    )
+    for vertices in (8, 16, 32, 64, 96, 128, 192, 256, 512, 2048):
+        piece = Polygon(
+            [
+                (20 * cos(2 * pi * i / vertices), 20 * sin(2 * pi * i / vertices))
+                for i in range(vertices)
+            ]
+        )
+        bound = piece.boundary
+        lines = [
+            extend_line(
+                LineString(
+                    [bound.interpolate(rng.random(), normalized=True) for _ in range(2)]
+                )
+            )
+            for _ in range(CUTS)
+        ]
+        coords = [tuple(xy for p in line.coords for xy in p) for line in lines]
+
+        start = perf_counter()
+        for _ in range(20):
+            ConvexPiece(piece).is_convex
+        build = (perf_counter() - start) / 20
+
+        start = perf_counter()
+        for line in lines:
+            not piece.touches(line) and line.crosses(piece)
+        predicates = (perf_counter() - start) / CUTS
+
+        # warmed up, as the index is only built for pieces asked repeatedly
+        edge_index = EdgeIndex(piece)
+        for xy in coords:
+            edge_index.crosses_properly(*xy)
+        start = perf_counter()
+        for line, xy in zip(lines, coords):
+            edge_index.crosses_properly(*xy) or (
+                not piece.touches(line) and line.crosses(piece)
+            )
+        edges = (perf_counter() - start) / CUTS
+
+        convex = ConvexPiece(piece)
+        convex.is_convex
+        start = perf_counter()
+        hits = 0
+        for line, xy in zip(lines, coords):
+            if convex.chord(*xy) is not None:
+                hits += 1
+            else:
+                not piece.touches(line) and line.crosses(piece)
+        chord = (perf_counter() - start) / CUTS
+
+        print(
+            f"{vertices:>9} {build * 1e6:>11.1f} {predicates * 1e6:>16.1f} "
+            f"{edges * 1e6:>11.1f} {chord * 1e6:>11.1f} {hits / CUTS:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
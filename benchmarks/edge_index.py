@@ -0,0 +1,86 @@
+"""Edge index queries against shapely's predicates on high-vertex cakes.
+
+The shapely side is what cut validation did per line and endpoint: the
+touches/crosses pair and the distance of the endpoints to the boundary.
+The index side is timed once built; "build" is what building it costs,
+which only pieces queried repeatedly pay. Run from the repository root:
+
+    uv run python -m benchmarks.edge_index
+"""
+
+import random
+from time import perf_counter
+
+from shapely import LineString, Point
+
+from src.cake import extend_line, read_cake
+from src.edge_index import EdgeIndex
+import src.constants as c
+
+CAKES = [
+    "cakes/players/player1/star.csv",
+    "cakes/players/player8/koch_snowflake_order3.csv",
+    "cakes/players/player4/hilbert_challenging.csv",
+    "cakes/players/player9/minkowski.csv",
+]
+
+CUTS = 1000
+
+
+def main():
+    rng = random.Random(0)
+    print(
+        f"{'cake':>48} {'edges':>6} {'build (us)':>11} "
+        f"{'predicates (us)':>16} {'indexed (us)':>13} "
+        f"{'on boundary (us)':>17} {'indexed (us)':>13}"
+    )
+    for path in CAKES:
+        piece = read_cake(path, 10, True).exterior_shape
+        bound = piece.boundary
+        lines = [
+            extend_line(
+                LineString(
+                    [bound.interpolate(rng.random(), normalized=True) for _ in range(2)]
+                )
+            )
+            for _ in range(CUTS)
+        ]
+        coords = [tuple(xy for p in line.coords for xy in p) for line in lines]
+        points = [(p.x, p.y) for line in lines for p in map(Point, line.coords)]
+
+        start = perf_counter()
+        for line in lines:
+            piece.touches(line) or line.crosses(piece)
+        predicates = (perf_counter() - start) / CUTS
+
+        start = perf_counter()
+        for _ in range(100):
+            EdgeIndex(piece).edges()
+        build = (perf_counter() - start) / 100
+
+        edges = EdgeIndex(piece)
+        edges.edges()
+        start = perf_counter()
+        for ax, ay, bx, by in coords:
+            edges.crosses_properly(ax, ay, bx, by)
+        indexed = (perf_counter() - start) / CUTS
+
+        start = perf_counter()
+        for x, y in points:
+            Point(x, y).distance(bound) <= c.TOL
+        distance = (perf_counter() - start) / len(points)
+
+        start = perf_counter()
+        for x, y in points:
+            edges.on_boundary(x, y, c.TOL)
+        on_boundary = (perf_counter() - start) / len(points)
+
+        print(
+            f"{path:>48} {len(bound.coords) - 1:>6} {build * 1e6:>11.1f} "
+            f"{predicates * 1e6:>16.1f} "
+            f"{indexed * 1e6:>13.1f} {distance * 1e6:>17.1f} {on_boundary * 1e6:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Half-plane area kernel against the split-based probing used by players.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.halfplane_areas
+"""
+
+from math import cos, sin
+from time import perf_counter
+
+import numpy as np
+from shapely import LineString, Polygon
+from shapely.ops import split
+
+from src.cake import read_cake
+from src.halfplane import halfplane_areas, projection_bounds
+
+CAKES = [
+    "cakes/rectangle.csv",
+    "cakes/players/player1/star.csv",
+    "cakes/players/player8/koch_snowflake_order3.csv",
+]
+
+
+def split_area(piece: Polygon, angle: float, offset: float) -> float:
+    """Area of `piece` below `offset` along `angle`, the way players probe it."""
+    nx, ny = cos(angle), sin(angle)
+    reach = 2 * max(
+        piece.bounds[2] - piece.bounds[0], piece.bounds[3] - piece.bounds[1]
+    )
+    mx, my = nx * offset, ny * offset
+    line = LineString(
+        [(mx - ny * reach, my + nx * reach), (mx + ny * reach, my - nx * reach)]
+    )
+    return sum(
+        part.area
+        for part in split(piece, line).geoms
+        if nx * part.centroid.x + ny * part.centroid.y <= offset
+    )
+
+
+def main():
+    angles = np.linspace(0, np.pi, 24, endpoint=False)
+    print(
+        f"{'cake':>50} {'probes':>7} {'split (ms)':>11} {'kernel (ms)':>12} {'max err':>9}"
+    )
+    for path in CAKES:
+        piece = read_cake(path, 10, True).exterior_shape
+        lo, hi = projection_bounds(piece, angles).T
+        offsets = np.linspace(0, 1, 42)[1:-1]
+        grid = lo[:, None] + (hi - lo)[:, None] * offsets
+
+        start = perf_counter()
+        expected = np.array(
+            [[split_area(piece, a, d) for d in row] for a, row in zip(angles, grid)]
+        )
+        slow = perf_counter() - start
+
+        start = perf_counter()
+        got = np.array(
+            [halfplane_areas(piece, [a], row)[0] for a, row in zip(angles, grid)]
+        )
+        fast = perf_counter() - start
+
+        err = np.abs(got - expected).max()
+        print(
+            f"{path:>50} {grid.size:>7} {slow * 1e3:>11.1f} {fast * 1e3:>12.1f} {err:>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
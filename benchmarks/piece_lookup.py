@@ -0,0 +1,89 @@
+"""Endpoint-to-piece lookup cost as the number of pieces grows.
+
+Lookups scanning all pieces are timed against lookups in the built index,
+along with what building the index costs a freshly built cake (players
+build those) and what a cut costs with and without an index to keep up to
+date. The scanning side lifts `PIECE_INDEX_MIN_PIECES`, so it never builds
+the index. Run from the repository root:
+
+    uv run python -m benchmarks.piece_lookup
+"""
+
+import random
+from time import perf_counter
+
+from shapely import Point, Polygon
+
+from src.cake import Cake
+import src.constants as c
+
+
+def sliced_cake(pieces: int) -> Cake:
+    """A rectangular cake cut into `pieces` vertical strips."""
+    width = 2 * pieces
+    cake = Cake(Polygon([(0, 0), (width, 0), (width, 10), (0, 10)]), pieces, True)
+    for x in range(2, width, 2):
+        cake.cut(Point(x, 0), Point(x, 10))
+    return cake
+
+
+def fresh_cake(cake: Cake) -> Cake:
+    """The cake's pieces in a new cake, the way players build them."""
+    new = object.__new__(Cake)
+    new.exterior_shape = cake.exterior_shape
+    new.interior_shape = cake.interior_shape
+    new.exterior_pieces = list(cake.exterior_pieces)
+    return new
+
+
+def per_item(run, items: list) -> float:
+    start = perf_counter()
+    for item in items:
+        run(item)
+    return (perf_counter() - start) / len(items)
+
+
+def main():
+    rng = random.Random(0)
+    threshold = c.PIECE_INDEX_MIN_PIECES
+    print(
+        f"{'pieces':>8} {'scan (us)':>10} {'build (us)':>11} {'indexed (us)':>13} "
+        f"{'scan cut (us)':>14} {'indexed cut (us)':>17}"
+    )
+    for pieces in (5, 10, 20, 30, 50, 100, 200, 400):
+        cake = sliced_cake(pieces)
+        points = []
+        for _ in range(500):
+            piece = rng.choice(cake.get_pieces())
+            points.append(piece.boundary.interpolate(rng.random(), normalized=True))
+        # halve the last strip
+        x = 2 * pieces - 1
+        cut = Point(x, 0), Point(x, 10)
+
+        c.PIECE_INDEX_MIN_PIECES = float("inf")
+        scanned = fresh_cake(cake)
+        scan = per_item(scanned.get_intersecting_pieces_from_point, points)
+        scan_cut = per_item(
+            lambda new: new.cut(*cut), [fresh_cake(cake) for _ in range(200)]
+        )
+        c.PIECE_INDEX_MIN_PIECES = threshold
+
+        build = per_item(
+            lambda new: new.get_piece_index(), [fresh_cake(cake) for _ in range(100)]
+        )
+        indexed = fresh_cake(cake)
+        indexed.get_piece_index()
+        lookup = per_item(indexed.get_intersecting_pieces_from_point, points)
+        built = [fresh_cake(cake) for _ in range(200)]
+        for new in built:
+            new.get_piece_index()
+        indexed_cut = per_item(lambda new: new.cut(*cut), built)
+
+        print(
+            f"{pieces:>8} {scan * 1e6:>10.1f} {build * 1e6:>11.1f} {lookup * 1e6:>13.1f} "
+            f"{scan_cut * 1e6:>14.1f} {indexed_cut * 1e6:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Bulk piece queries and the piece order against loops over the piece list.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.piece_queries
+"""
+
+from time import perf_counter
+
+from shapely import Point, Polygon
+
+from src.cake import Cake
+
+REPEAT = 20
+
+
+def sliced_cake(pieces: int) -> Cake:
+    """A rectangular cake cut into `pieces` vertical strips."""
+    width = 2 * pieces
+    cake = Cake(Polygon([(0, 0), (width, 0), (width, 10), (0, 10)]), pieces, True)
+    for x in range(2, width, 2):
+        cake.cut(Point(x, 0), Point(x, 10))
+    return cake
+
+
+def timed(query) -> float:
+    start = perf_counter()
+    for _ in range(REPEAT):
+        query()
+    return (perf_counter() - start) / REPEAT
+
+
+def main():
+    print(
+        f"{'pieces':>8} {'loop areas (us)':>16} {'areas (us)':>11} "
+        f"{'loop interior (ms)':>19} {'interior (ms)':>14} "
+        f"{'loop largest (us)':>18} {'largest (us)':>13} {'ordered (us)':>13}"
+    )
+    for pieces in (10, 100, 400):
+        cake = sliced_cake(pieces)
+        interior = cake.interior_shape
+
+        loop_areas = timed(lambda: [p.area for p in cake.get_pieces()])
+        areas = timed(cake.areas)
+
+        loop_interior = timed(
+            lambda: [p.intersection(interior).area for p in cake.get_pieces()]
+        )
+        # uncached, the records would answer repeated calls
+        start = perf_counter()
+        for _ in range(REPEAT):
+            fresh = cake.copy()
+            fresh.exterior_pieces = list(cake.get_pieces())
+            fresh.interior_areas()
+        bulk_interior = (perf_counter() - start) / REPEAT
+
+        loop_largest = timed(lambda: max(cake.get_pieces(), key=lambda p: p.area))
+        largest = timed(cake.largest)
+        cake.get_piece_order()
+        ordered = timed(lambda: cake.get_piece_order().largest())
+
+        print(
+            f"{pieces:>8} {loop_areas * 1e6:>16.1f} {areas * 1e6:>11.1f} "
+            f"{loop_interior * 1e3:>19.2f} {bulk_interior * 1e3:>14.2f} "
+            f"{loop_largest * 1e6:>18.1f} {largest * 1e6:>13.1f} {ordered * 1e6:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
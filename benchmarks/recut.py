@@ -0,0 +1,60 @@
+"""Moving one cut with `Cake.recut` against replaying the whole cut list.
+
+The cake is halved recursively, and a cut one level above the leaves is
+moved back and forth, so its subtree holds only a few cuts. Run from the
+repository root:
+
+    uv run python -m benchmarks.recut
+"""
+
+from time import perf_counter
+
+from shapely import Point, Polygon
+
+from src.cake import Cake
+
+REPEAT = 10
+
+
+def halving_cuts(x0: float, x1: float, depth: int) -> list[tuple[Point, Point]]:
+    """Cuts halving the strip between x0 and x1 recursively, parents first."""
+    if depth == 0:
+        return []
+    mid = (x0 + x1) / 2
+    return (
+        [(Point(mid, 0), Point(mid, 10))]
+        + halving_cuts(x0, mid, depth - 1)
+        + halving_cuts(mid, x1, depth - 1)
+    )
+
+
+def main():
+    print(f"{'cuts':>6} {'replay all (ms)':>16} {'recut (ms)':>11}")
+    for depth in (4, 6, 8):
+        width = 2**depth
+        shape = Polygon([(0, 0), (width, 0), (width, 10), (0, 10)])
+        cuts = halving_cuts(0, width, depth)
+        cake = Cake(shape, len(cuts) + 1, True)
+        cake.replay(cuts)
+
+        # the last cut with children: halving the last strip of four
+        k = max(i for i in range(len(cuts)) if cake.get_cut_tree().children(i))
+        (a, b), x = cuts[k], cuts[k][0].x
+        moved = (Point(x + 0.25, 0), Point(x + 0.25, 10))
+
+        start = perf_counter()
+        for i in range(REPEAT):
+            fresh = Cake(shape, len(cuts) + 1, True)
+            fresh.replay(cuts[:k] + [moved if i % 2 == 0 else (a, b)] + cuts[k + 1 :])
+        replay = (perf_counter() - start) / REPEAT
+
+        start = perf_counter()
+        for i in range(REPEAT):
+            cake.recut(k, *(moved if i % 2 == 0 else (a, b)))
+        recut = (perf_counter() - start) / REPEAT
+
+        print(f"{len(cuts):>6} {replay * 1e3:>16.2f} {recut * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
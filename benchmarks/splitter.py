@@ -0,0 +1,131 @@
+"""The ring-walking splitter against shapely.ops.split on every cake.
+
+For every valid cake in cakes/, cuts it into a few pieces at random, then
+splits random pieces along random extended chords both ways. Checks that
+the two agree on the number of pieces and, up to `TOL`, on the pieces
+themselves, counts how often they also agree on the order of the pieces and
+on their rings vertex for vertex, and times both on the chords the splitter
+handles. `split_areas`, which validation uses to reject cuts, is checked
+against the areas of the pieces and timed as well. Run from the repository
+root:
+
+    uv run python -m benchmarks.splitter
+"""
+
+import random
+from glob import glob
+from time import perf_counter
+
+from shapely import LineString, Polygon
+from shapely.ops import split
+
+from src.cake import Cake, InvalidCakeException, extend_line, read_cake
+from src.splitter import count_split_pieces, split_areas, split_simple
+
+CUTS = 6
+CHORDS = 200
+
+# distance vertices of matching pieces may be apart
+TOL = 1e-9
+
+
+def chords(cake: Cake, rng: random.Random) -> list[tuple[Polygon, LineString]]:
+    pieces = cake.get_pieces()
+    found = []
+    for _ in range(CHORDS):
+        piece = rng.choice(pieces)
+        ring = piece.exterior
+        a, b = (ring.interpolate(rng.random(), normalized=True) for _ in range(2))
+        found.append((piece, extend_line(LineString([a, b]))))
+    return found
+
+
+def random_cuts(cake: Cake, rng: random.Random):
+    for _ in range(CUTS):
+        ring = rng.choice(cake.get_pieces()).exterior
+        for _ in range(50):
+            a, b = (ring.interpolate(rng.random(), normalized=True) for _ in range(2))
+            validated, _ = cake.validate_cut(a, b)
+            if validated is not None:
+                cake.apply_cut(validated)
+                break
+
+
+def same_pieces(ours: list[Polygon], theirs: list[Polygon]) -> bool:
+    left = [other.normalize() for other in theirs]
+    for piece in ours:
+        piece = piece.normalize()
+        match = next((other for other in left if piece.equals_exact(other, TOL)), None)
+        if match is None:
+            return False
+        left.remove(match)
+    return not left
+
+
+def main():
+    print(
+        f"{'cake':<44} {'chords':>7} {'handled':>8} {'> 2':>4} {'agree':>6} "
+        f"{'order':>6} {'exact':>6} {'split (us)':>11} {'ours (us)':>10} "
+        f"{'areas (us)':>11}"
+    )
+    for path in sorted(glob("cakes/*.csv") + glob("cakes/players/*/*.csv")):
+        rng = random.Random(0)
+        try:
+            cake = read_cake(path, CUTS + 1, True)
+        except InvalidCakeException:
+            continue
+        random_cuts(cake, rng)
+        cases = chords(cake, rng)
+        ours = [split_simple(piece, line) for piece, line in cases]
+
+        # timed on the chords both handle
+        handled_cases = [case for case, mine in zip(cases, ours) if mine is not None]
+        start = perf_counter()
+        for piece, line in handled_cases:
+            split(piece, line)
+        split_time = (perf_counter() - start) / len(handled_cases)
+
+        start = perf_counter()
+        for piece, line in handled_cases:
+            split_simple(piece, line)
+        our_time = (perf_counter() - start) / len(handled_cases)
+
+        start = perf_counter()
+        for piece, line in handled_cases:
+            split_areas(piece, line)
+        areas_time = (perf_counter() - start) / len(handled_cases)
+
+        handled = more = agree = order = exact = 0
+        for (piece, line), mine in zip(cases, ours):
+            if mine is None:
+                continue
+            other = list(split(piece, line).geoms)
+            handled += 1
+            if count_split_pieces(piece, line) != len(mine):
+                raise AssertionError(f"{path}: piece count disagrees with pieces")
+            areas = split_areas(piece, line)
+            if areas is None or any(
+                abs(area - p.area) > TOL * max(1.0, p.area)
+                for area, p in zip(areas, mine, strict=True)
+            ):
+                raise AssertionError(f"{path}: areas disagree with pieces")
+            more += len(mine) > 2
+            if len(mine) != len(other) or not same_pieces(mine, other):
+                continue
+            agree += 1
+            if all(
+                p.normalize().equals_exact(q.normalize(), TOL)
+                for p, q in zip(mine, other)
+            ):
+                order += 1
+                exact += all(p.equals_exact(q, 0) for p, q in zip(mine, other))
+
+        print(
+            f"{path:<44} {len(cases):>7} {handled:>8} {more:>4} {agree:>6} "
+            f"{order:>6} {exact:>6} {split_time * 1e6:>11.1f} {our_time * 1e6:>10.1f} "
+            f"{areas_time * 1e6:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
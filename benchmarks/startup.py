@@ -0,0 +1,74 @@
+"""Cold-start time of a random player game, and the imports that dominate it.
+
+Compares the game as it runs now, importing only the selected player,
+against importing every registered player up front. The slowest imports
+come from `python -X importtime`. Run from the repository root:
+
+    uv run python -m benchmarks.startup
+"""
+
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+from players.registry import PLAYERS
+
+REPEAT = 5
+TOP = 10
+
+GAME = [
+    "main.py",
+    "--player",
+    "r",
+    "--seed",
+    "1",
+    "--import-cake",
+    "cakes/rectangle.csv",
+]
+
+# the same game, after importing every registered player module first
+EAGER = "; ".join(
+    [f"import {path.partition(':')[0]}" for path in PLAYERS.values()]
+    + [f"import sys; sys.argv = {GAME!r}", "import runpy", "runpy.run_path('main.py')"]
+)
+
+
+def cold_start(command: list[str]) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def slowest_imports(command: list[str]) -> list[tuple[int, str]]:
+    """(cumulative microseconds, package) of the slowest packages imported."""
+    done = subprocess.run(command, check=True, capture_output=True, text=True)
+    found = []
+    for line in done.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # packages, wherever they are first imported, rather than submodules
+        if "." not in name.strip():
+            found.append((int(cumulative), name.strip()))
+    return sorted(found, reverse=True)[:TOP]
+
+
+def main():
+    lazy = cold_start([sys.executable, *GAME])
+    eager = cold_start([sys.executable, "-c", EAGER])
+    print(f"random player, lazy registry:   {lazy * 1e3:8.1f} ms")
+    print(f"random player, all players:     {eager * 1e3:8.1f} ms")
+
+    print(f"\nslowest packages to import (lazy registry, {TOP} shown):")
+    for cumulative, name in slowest_imports(
+        [sys.executable, "-X", "importtime", *GAME]
+    ):
+        print(f"{cumulative / 1e3:10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -73,7 +73,7 @@ class Player5(Player):
             if self._time_exceeded(start_time):
                 return moves
 
-            piece = max(temp_cake.get_pieces(), key=lambda p: p.area)
+            piece = temp_cake.largest()[0]
             piece = self._clean(piece)
 
             r = self.children - i
@@ -812,7 +812,13 @@ class Player5(Player):
             def is_endpoint(pt: Point) -> bool:
                 return (pt.distance(a) <= 1e-10) or (pt.distance(b) <= 1e-10)
 
-            for p in cake_obj.get_pieces():
+            # a cut through poly can only meet the pieces touching poly
+            if cake_obj.get_cuttable_piece(a, b)[0] is poly:
+                others = [p for p, _ in cake_obj.get_piece_neighbours(poly)]
+            else:
+                others = cake_obj.get_pieces()
+
+            for p in others:
                 if p.equals(poly) or (
                     abs(p.area - poly.area) < 1e-9
                     and p.symmetric_difference(poly).area < 1e-9
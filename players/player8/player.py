@@ -1,3 +1,5 @@
+import numpy as np
+import shapely
 from shapely.geometry import Point, LineString
 from shapely.ops import split
 from players.player import Player
@@ -93,7 +95,7 @@ class Player8(Player):
         moves: list[tuple[Point, Point]] = []
 
         for cut_index, t_area in enumerate(target_areas):
-            piece = max(self.cake.get_pieces(), key=lambda p: p.area)
+            piece = self.cake.largest()[0]
             boundary = piece.boundary
             boundary_len = boundary.length
 
@@ -104,7 +106,12 @@ class Player8(Player):
                 num_candidates = max(150, min(220, int(boundary_len / 1.2)))
 
             step = boundary.length / num_candidates
-            points = [boundary.interpolate(i * step) for i in range(num_candidates)]
+            offsets = np.arange(num_candidates) * step
+            points = list(
+                shapely.points(
+                    self.cake.get_piece_boundary(piece).interpolate_many(offsets)
+                )
+            )
 
             best_score = float("inf")
             best_cut = None
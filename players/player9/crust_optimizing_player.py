@@ -1,3 +1,5 @@
+import numpy as np
+import shapely
 from shapely import Point, LineString, MultiPoint
 from shapely.geometry import Polygon
 from shapely.ops import split
@@ -390,7 +392,7 @@ class CrustOptimizingPlayer(Player):
     def get_cuts(self) -> list[tuple[Point, Point]]:
         moves: list[tuple[Point, Point]] = []
 
-        piece = max(self.cake.get_pieces(), key=lambda p: p.area)
+        piece = self.cake.largest()[0]
         crust_ratio = self.cake.get_piece_ratio(piece)
         Total_Area = self.cake.exterior_shape.area
         Area_list = [(Total_Area / self.children) * i for i in range(1, self.children)]
@@ -400,14 +402,17 @@ class CrustOptimizingPlayer(Player):
             print(f"Cut {k + 1}/{self.children - 1}")
             best_line_list = []
             best_line = [100, None, None, 100]
-            piece = max(self.cake.get_pieces(), key=lambda p: p.area)
+            piece = self.cake.largest()[0]
             piece_boundary = piece.boundary
 
             num_candidates = 200
             step_size = piece_boundary.length / num_candidates
-            candidates = [
-                piece_boundary.interpolate(i * step_size) for i in range(num_candidates)
-            ]
+            offsets = np.arange(num_candidates) * step_size
+            candidates = list(
+                shapely.points(
+                    self.cake.get_piece_boundary(piece).interpolate_many(offsets)
+                )
+            )
 
             for i in range(num_candidates):
                 for j in range(i + 1, num_candidates):
@@ -2,7 +2,7 @@ from shapely import LineString, Point
 from random import shuffle
 
 from players.player import Player, PlayerException
-from src.cake import Cake
+from src.cake import Cake, ValidatedCut
 
 
 class RandomPlayer(Player):
@@ -10,7 +10,7 @@ class RandomPlayer(Player):
         super().__init__(children, cake, cake_path)
         print(f"I am {self}")
 
-    def find_random_cut(self) -> tuple[Point, Point]:
+    def find_random_cut(self) -> ValidatedCut:
         """Find a random cut.
 
         Algorithm:
@@ -19,7 +19,7 @@ class RandomPlayer(Player):
         3. Find two random lines whos centroids make
            a line that will cut the piece into two
         """
-        largest_piece = max(self.cake.get_pieces(), key=lambda piece: piece.area)
+        largest_piece = self.cake.largest()[0]
         vertices = list(largest_piece.exterior.coords[:-1])
         lines = [
             LineString([vertices[i], vertices[i + 1]]) for i in range(len(vertices) - 1)
@@ -36,9 +36,9 @@ class RandomPlayer(Player):
                 from_p = lines[i].centroid
                 to_p = lines[j].centroid
 
-                is_valid, _ = self.cake.cut_is_valid(from_p, to_p)
-                if is_valid:
-                    return (from_p, to_p)
+                validated, _ = self.cake.validate_cut(from_p, to_p)
+                if validated is not None:
+                    return validated
 
         raise PlayerException("could not find random move :(")
 
@@ -46,11 +46,11 @@ class RandomPlayer(Player):
         moves: list[tuple[Point, Point]] = []
 
         for _ in range(self.children - 1):
-            from_p, to_p = self.find_random_cut()
-            moves.append((from_p, to_p))
+            validated = self.find_random_cut()
+            moves.append((validated.from_p, validated.to_p))
 
             # simulate cut on our cake to ensure we have a
             # valid representation of our current environment
-            self.cake.cut(from_p, to_p)
+            self.cake.apply_cut(validated)
 
         return moves
@@ -0,0 +1,59 @@
+"""Where to find each player, imported only once it is picked.
+
+Player ids map to "module:Class" import paths. Importing a player module
+pulls in everything it needs (numpy, joblib, profilers, ...), so only the
+module of the player actually selected is ever imported.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from players.player import Player
+
+PLAYERS: dict[str, str] = {
+    "r": "players.random_player:RandomPlayer",
+    "1": "players.player1.player:Player1",
+    "2": "players.player2.player:Player2",
+    "3": "players.player3.player:Player3",
+    "4": "players.player4.player:Player4",
+    "5": "players.player5.player:Player5",
+    "6": "players.player6.player:Player6",
+    "7": "players.player7.player:Player7",
+    "8": "players.player8.player:Player8",
+    "9": "players.player9.player:Player9",
+    "10": "players.player10.player:Player10",
+    # variants kept next to the submitted players
+    "9-crust": "players.player9.crust_optimizing_player:CrustOptimizingPlayer",
+    "10-wed": "players.player10.player_wed:Player10",
+    "10-convex": "players.player10.player_convex:Player10",
+}
+
+
+def register(player: str, path: str):
+    """Make the class at `path` ("module:Class") available as `player`."""
+    if ":" not in path:
+        raise ValueError(f'expected "module:Class", got "{path}"')
+    PLAYERS[player] = path
+
+
+def player_key(player: int | str) -> str:
+    """Registry key of a player id as parsed by `sanitize_player`, 0 being random."""
+    if player == 0:
+        return "r"
+    return str(player)
+
+
+def is_player(player: str) -> bool:
+    """Whether `player` is a registered id or a "module:Class" path."""
+    return player in PLAYERS or ":" in player
+
+
+def get_player_class(player: int | str) -> type["Player"]:
+    """Import and return the class of a registered player id or "module:Class" path."""
+    key = player_key(player)
+    path = PLAYERS.get(key, key)
+    module, _, name = path.partition(":")
+    if not name:
+        raise KeyError(f'unknown player "{player}"')
+    return getattr(import_module(module), name)
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from math import sqrt
+from typing import Callable, Iterable
+
+from src.edge_index import EdgeIndex, segment_distance
+
+# (x0, y0, x1, y1) of a stretch of boundary two pieces share
+Segment = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class Contact:
+    """Where the boundaries of two pieces meet.
+
+    `segments` are the stretches of boundary both pieces run along, e.g. the
+    cut that separated them, `points` the isolated points where they touch,
+    e.g. where the ends of two cuts meet.
+    """
+
+    segments: tuple[Segment, ...]
+    points: tuple[tuple[float, float], ...]
+
+
+def _edge_contact(
+    e: Segment, f: Segment, tol: float
+) -> Segment | tuple[float, float] | None:
+    """The segment or point where edges e and f lie within `tol` of each other."""
+    ex0, ey0, ex1, ey1 = e
+    fx0, fy0, fx1, fy1 = f
+    f0_on_e = segment_distance(fx0, fy0, *e) <= tol
+    f1_on_e = segment_distance(fx1, fy1, *e) <= tol
+    e0_on_f = segment_distance(ex0, ey0, *f) <= tol
+    e1_on_f = segment_distance(ex1, ey1, *f) <= tol
+
+    # the two ends of the overlap, when the edges run along each other
+    if f0_on_e and f1_on_e:
+        ends = (fx0, fy0), (fx1, fy1)
+    elif e0_on_f and e1_on_f:
+        ends = (ex0, ey0), (ex1, ey1)
+    elif (f0_on_e or f1_on_e) and (e0_on_f or e1_on_f):
+        ends = (
+            (fx0, fy0) if f0_on_e else (fx1, fy1),
+            ((ex0, ey0) if e0_on_f else (ex1, ey1)),
+        )
+    elif f0_on_e or f1_on_e:
+        return (fx0, fy0) if f0_on_e else (fx1, fy1)
+    elif e0_on_f or e1_on_f:
+        return (ex0, ey0) if e0_on_f else (ex1, ey1)
+    else:
+        return None
+
+    (x0, y0), (x1, y1) = ends
+    if sqrt((x1 - x0) * (x1 - x0) + (y1 - y0) * (y1 - y0)) <= tol:
+        return x0, y0
+    return x0, y0, x1, y1
+
+
+def find_contact(a: EdgeIndex, b: EdgeIndex, tol: float) -> Contact | None:
+    """Where the boundaries of two pieces come within `tol`, None if nowhere."""
+    if len(a.edges()) > len(b.edges()):
+        a, b = b, a
+
+    segments: list[Segment] = []
+    points: list[tuple[float, float]] = []
+    for e in a.edges():
+        for f in b.edges_near_segment(*e, tol):
+            found = _edge_contact(e, f, tol)
+            if found is None:
+                continue
+            if len(found) == 4:
+                segments.append(found)
+            else:
+                points.append(found)
+
+    # points where shared stretches end, or repeats of one another, are not
+    # separate contacts
+    isolated: list[tuple[float, float]] = []
+    for x, y in points:
+        if any(segment_distance(x, y, *s) <= tol for s in segments):
+            continue
+        if any(abs(x - px) <= tol and abs(y - py) <= tol for px, py in isolated):
+            continue
+        isolated.append((x, y))
+
+    if not segments and not isolated:
+        return None
+    return Contact(tuple(segments), tuple(isolated))
+
+
+class PieceAdjacency:
+    """Which pieces of a cake touch, kept up to date cut by cut.
+
+    Pieces are identified by opaque integer keys. A cut only changes the
+    neighbourhood of the piece it splits: the neighbours of either half are
+    among the neighbours of the piece and the other half. So `replace` just
+    records those as candidates, and contacts are computed on demand, once
+    per pair, when `neighbours` is asked. Both the update and the (repeated)
+    query cost O(degree).
+
+    Maps of a piece's neighbours are replaced rather than mutated on
+    updates, so copies can share the maps of untouched pieces.
+    """
+
+    def __init__(self):
+        # key -> {neighbour key -> contact, or None while not computed yet}
+        self.__contacts: dict[int, dict[int, Contact | None]] = {}
+
+    def copy(self) -> "PieceAdjacency":
+        new = PieceAdjacency()
+        new.__contacts = dict(self.__contacts)
+        return new
+
+    def __len__(self) -> int:
+        return len(self.__contacts)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.__contacts
+
+    def add(self, key: int, candidates: Iterable[int]):
+        """Add a piece that may touch the pieces of `candidates`."""
+        # pieces added earlier may list this one without it being among its
+        # own candidates, so merge rather than overwrite, in both directions
+        contacts = self.__contacts
+        known = contacts.get(key, {})
+        contacts[key] = known | {
+            other: None for other in candidates if other != key and other not in known
+        }
+        for other in contacts[key]:
+            if key not in contacts.get(other, {}):
+                contacts[other] = contacts.get(other, {}) | {key: None}
+
+    def replace(self, old: list[int], new: list[int]):
+        """Swap pieces `old` for pieces `new` covering the same area.
+
+        Used both for cuts (one piece for its halves) and for undoing them.
+        """
+        gone = set(old)
+        around = dict.fromkeys(
+            other
+            for key in old
+            for other in self.__contacts.pop(key)
+            if other not in gone
+        )
+        for other in around:
+            kept = self.__contacts[other]
+            updated = {key: kept[key] for key in kept if key not in gone}
+            self.__contacts[other] = updated | dict.fromkeys(new)
+        for key in new:
+            self.__contacts[key] = dict.fromkeys(
+                [*around, *(other for other in new if other != key)]
+            )
+
+    def neighbours(
+        self, key: int, contact_of: Callable[[int, int], Contact | None]
+    ) -> dict[int, Contact]:
+        """The pieces touching piece `key`, with where they touch it.
+
+        `contact_of(key, other)` computes contacts not known yet, e.g. with
+        `find_contact`.
+        """
+        contacts = self.__contacts[key]
+        pending = [other for other, contact in contacts.items() if contact is None]
+        if pending:
+            # the maps may be shared with copies, which hold the same pieces
+            # for the same keys, so filling in contacts is safe in place
+            for other in pending:
+                contact = contact_of(key, other)
+                if contact is None:
+                    # a copy sharing either map may have dropped the pair
+                    # already
+                    contacts.pop(other, None)
+                    self.__contacts[other].pop(key, None)
+                else:
+                    contacts[other] = contact
+                    self.__contacts[other][key] = contact
+        return {
+            other: contact for other, contact in contacts.items() if contact is not None
+        }
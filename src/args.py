@@ -4,11 +4,13 @@ import os
 import pathlib
 from time import time
 
+from players.registry import is_player
+
 
 @dataclass
 class Args:
     gui: bool
-    player: int
+    player: int | str
     import_cake: str | None
     seed: int
     children: int
@@ -70,15 +72,19 @@ def sanitize_seed(org_seed: None | str) -> int:
     return int(org_seed)
 
 
-def sanitize_player(org_player: str) -> int:
+def sanitize_player(org_player: str) -> int | str:
     if org_player.isdigit() and 1 <= int(org_player) <= 10:
         return int(org_player)
 
     elif org_player == "r":
         return 0
 
+    elif is_player(org_player):
+        return org_player
+
     raise Exception(
-        f'unknown `--player` value provided: "{org_player}". Expected digit 1<=10 or "r"'
+        f'unknown `--player` value provided: "{org_player}". Expected digit 1<=10, "r", '
+        'a registered variant or "module:Class"'
     )
 
 
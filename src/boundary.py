@@ -0,0 +1,268 @@
+from bisect import bisect_right
+from math import ceil, floor, inf, sqrt
+
+import numpy as np
+import shapely
+from shapely import Point, Polygon
+
+# project() scans all segments of rings up to this size instead of a grid
+_SCAN_SEGMENTS = 32
+
+# upper bound on the elements of the temporary (points, segments) arrays
+_CHUNK = 1 << 20
+
+# snaps answered by shapely before the boundary is parametrized, building it
+# pays off only for pieces snapped to repeatedly
+_SHAPELY_SNAPS = 32
+
+
+class BoundaryParam:
+    """Arc-length parametrization of a piece's exterior ring.
+
+    Mirrors `piece.boundary.interpolate` and `piece.boundary.project` for
+    pieces without holes, with the same arithmetic as GEOS so the results
+    agree exactly. Cumulative segment lengths make `interpolate` a binary
+    search, and `project` only looks at the segments near the point, found
+    through a uniform grid over the segments' bounding boxes. The `_many`
+    variants handle arrays of parameters or points at once.
+
+    Everything is computed on first use, so creating one is free. `snap`
+    asks shapely until the piece has been snapped to a few times.
+    """
+
+    def __init__(self, piece: Polygon):
+        self.piece = piece
+        self.__built = False
+        self.__grid: dict[tuple[int, int], list[int]] | None = None
+        self.__snaps = 0
+
+    def __build(self):
+        coords = shapely.get_coordinates(self.piece.exterior)
+        self.xy = coords
+        self.xs, self.ys = coords[:, 0].tolist(), coords[:, 1].tolist()
+        xs, ys = self.xs, self.ys
+
+        self.dxs = [xs[k + 1] - xs[k] for k in range(len(xs) - 1)]
+        self.dys = [ys[k + 1] - ys[k] for k in range(len(ys) - 1)]
+        self.length2s = [dx * dx + dy * dy for dx, dy in zip(self.dxs, self.dys)]
+        self.lengths = [sqrt(length2) for length2 in self.length2s]
+
+        # running sums in segment order, exactly like GEOS walks the ring
+        self.cumulative = [0.0]
+        total = 0.0
+        for length in self.lengths:
+            total += length
+            self.cumulative.append(total)
+        self.__built = True
+
+    @property
+    def length(self) -> float:
+        if not self.__built:
+            self.__build()
+        return self.cumulative[-1]
+
+    def interpolate(self, distance: float) -> tuple[float, float]:
+        """The point `distance` along the boundary, clamped to its ends."""
+        if not self.__built:
+            self.__build()
+        xs, ys, cumulative = self.xs, self.ys, self.cumulative
+        if distance <= 0:
+            return xs[0], ys[0]
+
+        # the first segment reaching beyond `distance`
+        k = bisect_right(cumulative, distance) - 1
+        if k >= len(self.lengths):
+            return xs[-1], ys[-1]
+
+        frac = (distance - cumulative[k]) / self.lengths[k]
+        if frac <= 0:
+            return xs[k], ys[k]
+        if frac >= 1:
+            return xs[k + 1], ys[k + 1]
+        return xs[k] + frac * self.dxs[k], ys[k] + frac * self.dys[k]
+
+    def interpolate_many(self, distances) -> np.ndarray:
+        """Vectorized `interpolate`, returns an (n, 2) array of points."""
+        if not self.__built:
+            self.__build()
+        xy = self.xy
+        cumulative = np.asarray(self.cumulative)
+        lengths = np.asarray(self.lengths)
+        distances = np.asarray(distances, dtype=float)
+
+        k = np.searchsorted(cumulative, distances, side="right") - 1
+        k = np.clip(k, 0, len(lengths) - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.clip((distances - cumulative[k]) / lengths[k], 0.0, 1.0)
+        points = xy[k] + np.nan_to_num(frac)[..., None] * (xy[k + 1] - xy[k])
+        points[distances <= 0] = xy[0]
+        points[distances >= cumulative[-1]] = xy[-1]
+        return points
+
+    def project(self, x: float, y: float) -> float:
+        """Distance along the boundary of the boundary point closest to (x, y)."""
+        _, k = self.__nearest(x, y)
+        x0, y0 = self.xs[k], self.ys[k]
+        start = self.cumulative[k]
+
+        if x == x0 and y == y0:
+            return start
+        if (x == self.xs[k + 1] and y == self.ys[k + 1]) or not self.length2s[k]:
+            return start + self.lengths[k]
+        r = ((x - x0) * self.dxs[k] + (y - y0) * self.dys[k]) / self.length2s[k]
+        if r <= 0:
+            return start
+        if r <= 1:
+            return start + r * self.lengths[k]
+        return start + self.lengths[k]
+
+    def project_many(self, points) -> np.ndarray:
+        """Vectorized `project` for an (n, 2) array of points."""
+        if not self.__built:
+            self.__build()
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        p0, p1 = self.xy[:-1], self.xy[1:]
+        d = p1 - p0
+        length2 = np.asarray(self.length2s)
+        lengths = np.asarray(self.lengths)
+        cumulative = np.asarray(self.cumulative)
+
+        result = np.empty(len(points))
+        step = max(1, _CHUNK // len(p0))
+        for lo in range(0, len(points), step):
+            x = points[lo : lo + step, 0, None]
+            y = points[lo : lo + step, 1, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = ((x - p0[:, 0]) * d[:, 0] + (y - p0[:, 1]) * d[:, 1]) / length2
+                s = ((p0[:, 1] - y) * d[:, 0] - (p0[:, 0] - x) * d[:, 1]) / length2
+            to_start = np.sqrt((x - p0[:, 0]) ** 2 + (y - p0[:, 1]) ** 2)
+            to_end = np.sqrt((x - p1[:, 0]) ** 2 + (y - p1[:, 1]) ** 2)
+            dist = np.where(
+                (length2 == 0) | (r <= 0),
+                to_start,
+                np.where(r >= 1, to_end, np.abs(s) * np.sqrt(length2)),
+            )
+
+            # argmin picks the first of equally close segments, like GEOS
+            k = np.argmin(dist, axis=1)
+            r = np.clip(np.nan_to_num(r[np.arange(len(k)), k]), 0.0, 1.0)
+            on_start = (x[:, 0] == p0[k, 0]) & (y[:, 0] == p0[k, 1])
+            on_end = (x[:, 0] == p1[k, 0]) & (y[:, 0] == p1[k, 1])
+            r[on_start], r[on_end] = 0.0, 1.0
+            result[lo : lo + step] = cumulative[k] + r * lengths[k]
+        return result
+
+    def snap(self, x: float, y: float) -> tuple[float, float]:
+        """`interpolate(project(x, y))`, the boundary point closest to (x, y)."""
+        if not self.__built and self.__snaps < _SHAPELY_SNAPS:
+            self.__snaps += 1
+            bound = self.piece.boundary
+            snapped = bound.interpolate(bound.project(Point(x, y)))
+            return snapped.x, snapped.y
+        return self.interpolate(self.project(x, y))
+
+    def distance(self, x: float, y: float) -> float:
+        """Distance from (x, y) to the boundary."""
+        return self.__nearest(x, y)[0]
+
+    def __closest(
+        self, segments, x: float, y: float, best: tuple[float, int]
+    ) -> tuple[float, int]:
+        """The closest of `segments` and `best`, with GEOS' point-segment distance."""
+        xs, ys, dxs, dys, length2s = self.xs, self.ys, self.dxs, self.dys, self.length2s
+        best_d, best_k = best
+        for k in segments:
+            x0, y0, length2 = xs[k], ys[k], length2s[k]
+            r = ((x - x0) * dxs[k] + (y - y0) * dys[k]) / length2 if length2 else 0.0
+            if r <= 0:
+                d = sqrt((x - x0) * (x - x0) + (y - y0) * (y - y0))
+            elif r >= 1:
+                x1, y1 = xs[k + 1], ys[k + 1]
+                d = sqrt((x - x1) * (x - x1) + (y - y1) * (y - y1))
+            else:
+                s = ((y0 - y) * dxs[k] - (x0 - x) * dys[k]) / length2
+                d = abs(s) * sqrt(length2)
+            # of equally close segments GEOS keeps the first
+            if d < best_d or (d == best_d and k < best_k):
+                best_d, best_k = d, k
+        return best_d, best_k
+
+    def __nearest(self, x: float, y: float) -> tuple[float, int]:
+        """Distance to and index of the first segment closest to (x, y)."""
+        if not self.__built:
+            self.__build()
+        n = len(self.lengths)
+        if n <= _SCAN_SEGMENTS:
+            return self.__closest(range(n), x, y, (inf, n))
+
+        grid = self.__get_grid()
+        ox, oy, size, cells = self.__origin + (self.__size, self.__cells)
+        ci = min(max(floor((x - ox) / size), 0), cells - 1)
+        cj = min(max(floor((y - oy) / size), 0), cells - 1)
+
+        # look at rings of cells around the point's cell until no segment
+        # outside of them can be closer than the best one found
+        best = (inf, n)
+        seen: set[int] = set()
+        for radius in range(cells):
+            found = [
+                k
+                for cell in _ring_cells(ci, cj, radius, cells)
+                for k in grid.get(cell, ())
+                if k not in seen
+            ]
+            seen.update(found)
+            best = self.__closest(found, x, y, best)
+
+            # the distance from (x, y) to the outside of the searched cells
+            reach = min(
+                x - (ox + (ci - radius) * size),
+                ox + (ci + radius + 1) * size - x,
+                y - (oy + (cj - radius) * size),
+                oy + (cj + radius + 1) * size - y,
+            )
+            if best[0] < reach:
+                break
+
+        return best
+
+    def __get_grid(self) -> dict[tuple[int, int], list[int]]:
+        if self.__grid is not None:
+            return self.__grid
+
+        xs, ys = self.xs, self.ys
+        n = len(self.lengths)
+        minx, miny, maxx, maxy = min(xs), min(ys), max(xs), max(ys)
+        self.__cells = cells = max(1, ceil(sqrt(n)))
+        self.__size = size = max(maxx - minx, maxy - miny, 1e-9) / cells
+        self.__origin = minx, miny
+
+        def cell(value: float, origin: float) -> int:
+            return min(floor((value - origin) / size), cells - 1)
+
+        grid: dict[tuple[int, int], list[int]] = {}
+        for k in range(n):
+            i0, i1 = sorted((cell(xs[k], minx), cell(xs[k + 1], minx)))
+            j0, j1 = sorted((cell(ys[k], miny), cell(ys[k + 1], miny)))
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    grid.setdefault((i, j), []).append(k)
+        self.__grid = grid
+        return grid
+
+
+def _ring_cells(ci: int, cj: int, radius: int, cells: int):
+    """The grid cells at Chebyshev distance `radius` from cell (ci, cj)."""
+    if radius == 0:
+        yield ci, cj
+        return
+    for i in range(max(ci - radius, 0), min(ci + radius, cells - 1) + 1):
+        if cj - radius >= 0:
+            yield i, cj - radius
+        if cj + radius < cells:
+            yield i, cj + radius
+    for j in range(max(cj - radius + 1, 0), min(cj + radius - 1, cells - 1) + 1):
+        if ci - radius >= 0:
+            yield ci - radius, j
+        if ci + radius < cells:
+            yield ci + radius, j
@@ -1,20 +1,65 @@
+import numpy as np
+import shapely
 from shapely import MultiPolygon, wkb
 from shapely.geometry import Polygon, JOIN_STYLE, LineString, Point, MultiPoint
 from shapely.validation import explain_validity
 from shapely.ops import split
-from math import atan2, pi, hypot
-from typing import cast
-from tkinter import Canvas
+from math import atan2, ceil, pi, hypot, sqrt
+from typing import TYPE_CHECKING, cast
 import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
 
+from src.adjacency import Contact, PieceAdjacency, find_contact
 from src.args import Args
+from src.boundary import BoundaryParam
+from src.convex import ConvexPiece
+from src.edge_index import EdgeIndex
+from src.lineage import CutRecord, CutTree
+from src.piece_order import PieceOrder
+from src.spatial import PieceGrid
+from src.splitter import split_areas
+from src.stats import PieceRecord, PieceStats
 import src.constants as c
 
+if TYPE_CHECKING:
+    from tkinter import Canvas
+
 
 class InvalidCakeException(Exception):
     pass
 
 
+class CutReason(IntEnum):
+    """Why a cut is valid or not, as reported by `Cake.cut_is_valid_many`."""
+
+    VALID = 0
+    NOT_WITHIN_CAKE = 1
+    MULTIPLE_PIECES = 2
+    NO_PIECE = 3
+    ON_BOUNDARY = 4
+    NOT_THROUGH_PIECE = 5
+    NOT_TWO_PIECES = 6
+    TOO_SMALL = 7
+
+    @property
+    def message(self) -> str:
+        return CUT_REASON_MESSAGES[self]
+
+
+CUT_REASON_MESSAGES = {
+    CutReason.VALID: "valid",
+    CutReason.NOT_WITHIN_CAKE: "cut is not within cake",
+    CutReason.MULTIPLE_PIECES: "line can cut multiple pieces, should only cut one",
+    CutReason.NO_PIECE: "line doesn't cut any piece of cake well",
+    CutReason.ON_BOUNDARY: "cut lies on piece boundary",
+    CutReason.NOT_THROUGH_PIECE: "line does not cut through piece",
+    CutReason.NOT_TWO_PIECES: "line doesn't cut piece in 2",
+    CutReason.TOO_SMALL: "line cuts a piece that's too small",
+}
+
+
 def extend_line(line: LineString) -> LineString:
     fraction = 0.05
     coords = list(line.coords)
@@ -37,10 +82,88 @@ def extend_line(line: LineString) -> LineString:
     return LineString([(x1n, y1n), (x2n, y2n)])
 
 
+def extend_lines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized `extend_line` for lines from the rows of `a` to those of `b`."""
+    fraction = 0.05
+    d = b - a
+    length = np.hypot(d[:, 0], d[:, 1])[:, None]
+
+    # same arithmetic as `extend_line`; zero-length lines stay as they are
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ext = np.where(length > 0, fraction * length * (d / length), 0.0)
+    return shapely.linestrings(np.stack([a - ext, b + ext], axis=1))
+
+
 def copy_geom(g):
     return wkb.loads(wkb.dumps(g))
 
 
+# cut regions of the last few exteriors by id, shared by all cakes with the
+# same exterior polygon: copies, and the cakes players put together from it
+_CUT_REGIONS: dict[int, tuple[Polygon, Polygon]] = {}
+_CUT_REGIONS_KEPT = 8
+
+
+def cut_region(exterior: Polygon) -> Polygon:
+    """Where cuts on a cake with `exterior` have to lie, prepared.
+
+    That is the exterior grown by `2 * TOL`, computed once per polygon.
+    """
+    cached = _CUT_REGIONS.get(id(exterior))
+    if cached is not None and cached[0] is exterior:
+        return cached[1]
+
+    region = exterior.buffer(c.TOL * 2)
+    shapely.prepare(region)
+    if len(_CUT_REGIONS) >= _CUT_REGIONS_KEPT:
+        del _CUT_REGIONS[next(iter(_CUT_REGIONS))]
+    _CUT_REGIONS[id(exterior)] = exterior, region
+    return region
+
+
+@dataclass(frozen=True)
+class ValidatedCut:
+    """A cut that passed validation, along with the split it produces.
+
+    `from_p` and `to_p` are the points the cut was requested with, `line` is
+    the snapped and extended line actually used to split `piece`.
+    """
+
+    piece: Polygon
+    from_p: Point
+    to_p: Point
+    line: LineString
+    pieces: tuple[Polygon, Polygon]
+
+
+@dataclass(frozen=True, slots=True)
+class _JournalEntry:
+    """What is needed to undo a cut: the replaced piece and its bookkeeping."""
+
+    piece: Polygon
+    index: int
+    pieces: list[Polygon]
+    record: PieceRecord | None
+    moments: tuple[int, float, float] | None
+    tags: dict[str, float] | None
+
+
+# state a cake shares with its copies, until either of them changes it
+_SHARED_STATE = (
+    "_owned",
+    "_index",
+    "_index_pieces",
+    "_records",
+    "_boundaries",
+    "_edges",
+    "_convex",
+    "_stats",
+    "_order",
+    "_adjacency",
+    "_lineage",
+)
+
+
 class Cake:
     def __init__(self, p: Polygon, num_children: int, sandbox: bool) -> None:
         self.exterior_shape = p
@@ -52,31 +175,327 @@ class Cake:
             self.exterior_shape, self.interior_shape, num_children, self.sandbox
         )
 
+    @property
+    def exterior_pieces(self) -> list[Polygon]:
+        return self._pieces
+
+    @exterior_pieces.setter
+    def exterior_pieces(self, pieces: list[Polygon]):
+        # derived indexes are rebuilt lazily for the new piece list
+        self._pieces = pieces
+        self._owned: dict[int, Polygon] | None = None
+        self._array: np.ndarray | None = None
+        self._index: PieceGrid | None = None
+        self._index_pieces: dict[int, Polygon] = {}
+        self._records: dict[int, PieceRecord] = {}
+        self._boundaries: dict[int, BoundaryParam] = {}
+        self._edges: dict[int, EdgeIndex] = {}
+        self._convex: dict[int, ConvexPiece] = {}
+        self._stats: PieceStats | None = None
+        self._order: PieceOrder | None = None
+        self._adjacency: PieceAdjacency | None = None
+        self._lineage = CutTree(pieces)
+        self._shared: set[str] = set()
+        self._journal: list[_JournalEntry] | None = None
+        self._savepoints: list[int] = []
+
     def copy(self):
+        """Copy this cake, sharing the (immutable) geometries with the original.
+
+        Only the piece list is duplicated up front. Indexes and statistics are
+        shared until either cake mutates them, at which point that cake makes
+        its own copy.
+        """
         new = object.__new__(Cake)
-        new.exterior_shape = copy_geom(self.exterior_shape)
-        new.interior_shape = copy_geom(self.interior_shape)
-        new.exterior_pieces = [copy_geom(p) for p in self.exterior_pieces]
+        new.exterior_shape = self.exterior_shape
+        new.interior_shape = self.interior_shape
+        new.exterior_pieces = list(self.exterior_pieces)
+        new._array = self._array
+
+        new._owned = self._owned
+        new._index = self._index
+        new._index_pieces = self._index_pieces
+        new._records = self._records
+        new._boundaries = self._boundaries
+        new._edges = self._edges
+        new._convex = self._convex
+        new._stats = self._stats
+        new._order = self._order
+        new._adjacency = self._adjacency
+        new._lineage = self._lineage
+        new._shared = set(_SHARED_STATE)
+        self._shared = set(_SHARED_STATE)
 
         return new
 
+    def __unshare(self, *names: str):
+        """Take private copies of state shared with other cakes before mutating it.
+
+        Only the attributes `names` are copied, all shared state if none are
+        given.
+        """
+        for name in names or _SHARED_STATE:
+            if name not in self._shared:
+                continue
+            self._shared.remove(name)
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, value.copy())
+
+    def get_piece_index(self) -> PieceGrid:
+        """Spatial index over the current pieces, built on first use.
+
+        Its cells are about the size of the pieces' bounding boxes when it is
+        built, so a point falls among only a few of them.
+        """
+        if self._index is None:
+            bounds = shapely.bounds(self._pieces)
+            widths, heights = (bounds[:, 2:] - bounds[:, :2]).T
+            cell = sqrt(float(np.mean(widths * heights)))
+            minx, miny, maxx, maxy = self.exterior_shape.bounds
+            cells = max(1, ceil(max(maxx - minx, maxy - miny) / max(cell, 1e-9)))
+            self._index = PieceGrid(self.exterior_shape.bounds, cells)
+            self._index_pieces = {id(piece): piece for piece in self._pieces}
+            self._index.insert_many(list(self._index_pieces), bounds)
+        return self._index
+
+    def __index_piece(self, piece: Polygon):
+        assert self._index is not None
+        self._index.insert(id(piece), piece.bounds)
+        self._index_pieces[id(piece)] = piece
+
+    def __unindex_piece(self, piece: Polygon):
+        assert self._index is not None
+        self._index.remove(id(piece))
+        del self._index_pieces[id(piece)]
+
+    def get_piece_record(self, piece: Polygon) -> PieceRecord:
+        """Area and interior area of `piece`, cached for pieces of this cake."""
+        record = self._records.get(id(piece))
+        if record is not None and record.piece is piece:
+            return record
+
+        interior_area = 0
+        if piece.intersects(self.interior_shape):
+            inter = piece.intersection(self.interior_shape)
+            interior_area = inter.area if not inter.is_empty else 0
+        record = PieceRecord(piece, piece.area, interior_area)
+
+        # only pieces of this cake are cached, other polygons come and go
+        if self.__owns(piece):
+            self.__unshare("_records")
+            self._records[id(piece)] = record
+        return record
+
+    def get_piece_boundary(self, piece: Polygon) -> BoundaryParam:
+        """Arc-length parametrization of the boundary of `piece`, cached like
+        `get_piece_record`."""
+        boundary = self._boundaries.get(id(piece))
+        if boundary is not None and boundary.piece is piece:
+            return boundary
+
+        boundary = BoundaryParam(piece)
+        if self.__owns(piece):
+            self.__unshare("_boundaries")
+            self._boundaries[id(piece)] = boundary
+        return boundary
+
+    def get_piece_edges(self, piece: Polygon) -> EdgeIndex:
+        """Spatial index over the edges of `piece`, cached like `get_piece_record`."""
+        edges = self._edges.get(id(piece))
+        if edges is not None and edges.piece is piece:
+            return edges
+
+        edges = EdgeIndex(piece)
+        if self.__owns(piece):
+            self.__unshare("_edges")
+            self._edges[id(piece)] = edges
+        return edges
+
+    def get_piece_convex(self, piece: Polygon) -> ConvexPiece:
+        """Convexity of `piece` and convex-only queries, cached like `get_piece_record`."""
+        convex = self._convex.get(id(piece))
+        if convex is not None and convex.piece is piece:
+            return convex
+
+        convex = ConvexPiece(piece)
+        if self.__owns(piece):
+            self.__unshare("_convex")
+            self._convex[id(piece)] = convex
+        return convex
+
+    def __owns(self, piece: Polygon) -> bool:
+        # pieces by id, built on first use and kept up to date by cuts
+        if self._owned is None:
+            self._owned = {id(own): own for own in self._pieces}
+        return self._owned.get(id(piece)) is piece
+
+    def get_piece_stats(self) -> PieceStats:
+        """Running score aggregates, kept up to date by `cut`."""
+        if self._stats is None:
+            self._stats = PieceStats()
+            for piece in self.exterior_pieces:
+                self._stats.add(self.get_piece_record(piece))
+        return self._stats
+
+    def get_piece_array(self) -> np.ndarray:
+        """The pieces as a NumPy object array, in `exterior_pieces` order."""
+        if self._array is None:
+            self._array = np.empty(len(self._pieces), dtype=object)
+            self._array[:] = self._pieces
+            # shared with copies of this cake, and replaced rather than updated
+            self._array.flags.writeable = False
+        return self._array
+
+    def areas(self) -> np.ndarray:
+        """Area of every piece."""
+        return shapely.area(self.get_piece_array())
+
+    def bounds(self) -> np.ndarray:
+        """(n, 4) array of the pieces' bounds, as minx, miny, maxx, maxy."""
+        return shapely.bounds(self.get_piece_array())
+
+    def interior_areas(self) -> np.ndarray:
+        """Interior area of every piece.
+
+        Pieces without a cached record are intersected with the interior in a
+        single call, and their records cached.
+        """
+        pieces = self.get_piece_array()
+        result = np.empty(len(pieces))
+        missing = []
+        for i, piece in enumerate(pieces):
+            record = self._records.get(id(piece))
+            if record is not None and record.piece is piece:
+                result[i] = record.interior_area
+            else:
+                missing.append(i)
+
+        if missing:
+            todo = pieces[missing]
+            areas = shapely.area(todo).tolist()
+            inner = shapely.area(shapely.intersection(todo, self.interior_shape))
+            self.__unshare("_records")
+            for piece, area, interior_area in zip(todo, areas, inner.tolist()):
+                self._records[id(piece)] = PieceRecord(piece, area, interior_area)
+            result[missing] = inner
+        return result
+
+    def ratios(self) -> np.ndarray:
+        """Crust ratio (interior over total area) of every piece."""
+        areas = self.areas()
+        ratios = np.zeros(len(areas))
+        np.divide(self.interior_areas(), areas, out=ratios, where=areas != 0)
+        return ratios
+
+    def largest(self, k: int = 1) -> list[Polygon]:
+        """The `k` largest pieces, largest first, earlier pieces first on ties."""
+        order = np.argsort(-self.areas(), kind="stable")[:k]
+        return self.get_piece_array()[order].tolist()
+
+    def argsort_by_ratio_error(self, target: float | None = None) -> np.ndarray:
+        """Piece indices ordered by how far their ratio is from `target`.
+
+        Closest first, `target` defaults to the ratio of the whole cake.
+        """
+        if target is None:
+            target = self.interior_shape.area / self.exterior_shape.area
+        return np.argsort(np.abs(self.ratios() - target), kind="stable")
+
+    def get_piece_order(
+        self, target_area: float | None = None, target_ratio: float | None = None
+    ) -> PieceOrder:
+        """Pieces ordered by area and by distance from the target area and ratio.
+
+        Built on first use and kept up to date by `cut`. Targets left out stay
+        as they are, initially the average piece area and the ratio of the
+        whole cake. Set tags through `set_piece_tags`, the order may be shared
+        with copies of this cake.
+        """
+        if self._order is None:
+            order = PieceOrder(
+                self.get_area() / len(self.exterior_pieces),
+                self.interior_shape.area / self.get_area(),
+            )
+            for piece in self.exterior_pieces:
+                order.add(self.get_piece_record(piece))
+            self._order = order
+
+        order = self._order
+        target_area = order.target_area if target_area is None else target_area
+        target_ratio = order.target_ratio if target_ratio is None else target_ratio
+        if (target_area, target_ratio) != (order.target_area, order.target_ratio):
+            self.__unshare("_order")
+            self._order.retarget(target_area, target_ratio)
+        return self._order
+
+    def get_piece_tags(self, piece: Polygon) -> dict[str, float]:
+        return self.get_piece_order().get_tags(piece)
+
+    def set_piece_tags(self, piece: Polygon, **tags: float | None):
+        """Tag `piece`, e.g. with the number of children it is meant for.
+
+        Tags are dropped when the piece is cut, and restored with it on
+        rollback. `PieceOrder.most` orders the pieces by a tag.
+        """
+        self.get_piece_order()
+        self.__unshare("_order")
+        assert self._order is not None
+        self._order.set_tags(piece, **tags)
+
+    def get_adjacency(self) -> PieceAdjacency:
+        """Which pieces touch, keyed by `id(piece)`, built on first use."""
+        if self._adjacency is None:
+            index = self.get_piece_index()
+            adjacency = PieceAdjacency()
+            for piece in self._pieces:
+                adjacency.add(
+                    id(piece), index.query_bounds(piece.bounds, c.PIECE_CONTACT_TOL)
+                )
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def __contact(self, key: int, other: int) -> Contact | None:
+        pieces = self._index_pieces
+        return find_contact(
+            self.get_piece_edges(pieces[key]),
+            self.get_piece_edges(pieces[other]),
+            c.PIECE_CONTACT_TOL,
+        )
+
+    def get_piece_neighbours(self, piece: Polygon) -> list[tuple[Polygon, Contact]]:
+        """The pieces touching `piece`, with where they touch it.
+
+        Pieces count as touching where their boundaries come within
+        `PIECE_CONTACT_TOL`. Raises KeyError if `piece` is not part of the cake.
+        """
+        if not self.__owns(piece):
+            raise KeyError("piece is not part of the cake")
+
+        neighbours = self.get_adjacency().neighbours(id(piece), self.__contact)
+        return [
+            (self._index_pieces[key], contact) for key, contact in neighbours.items()
+        ]
+
     def get_piece_sizes(self):
-        return [p.area for p in self.exterior_pieces]
+        return self.areas().tolist()
 
     def get_area(self):
         return self.exterior_shape.area
 
     def get_piece_ratio(self, piece: Polygon):
-        if piece.intersects(self.interior_shape):
-            inter = piece.intersection(self.interior_shape)
-            return inter.area / piece.area if not inter.is_empty else 0
-        return 0
+        return self.get_piece_record(piece).ratio
 
     def get_piece_ratios(self):
-        ratios = []
-        for piece in self.exterior_pieces:
-            ratios.append(self.get_piece_ratio(piece))
-        return ratios
+        return self.ratios().tolist()
+
+    def get_size_span(self) -> float:
+        """Difference between the largest and the smallest piece area."""
+        return self.get_piece_stats().size_span()
+
+    def get_ratio_stdev(self) -> float:
+        """Sample standard deviation of the pieces' crust ratios."""
+        return self.get_piece_stats().ratio_stdev()
 
     def get_offsets(self):
         minx, miny, maxx, maxy = self.exterior_shape.bounds
@@ -110,7 +529,7 @@ class Cake:
 
         return ext_points, int_points
 
-    def draw(self, canvas: Canvas, draw_angles=False):
+    def draw(self, canvas: "Canvas", draw_angles=False):
         x_offset, y_offset = self.get_offsets()
         ext_coords, int_coords = self.get_scaled_vertex_points()
         # draw crust
@@ -141,89 +560,232 @@ class Cake:
         return p.distance(piece.boundary) <= c.TOL
 
     def get_intersecting_pieces_from_point(self, p: Point):
+        # a few pieces are scanned quicker than the index is kept up to date
+        if self._index is None and len(self._pieces) < c.PIECE_INDEX_MIN_PIECES:
+            return [
+                piece
+                for piece in self._pieces
+                if self.point_lies_on_piece_boundary(p, piece)
+            ]
+
+        keys = self.get_piece_index().query_point(p.x, p.y, c.TOL)
         touched_pieces = [
             piece
-            for piece in self.exterior_pieces
+            for piece in map(self._index_pieces.__getitem__, keys)
             if self.point_lies_on_piece_boundary(p, piece)
         ]
 
         return touched_pieces
 
     def __cut_is_within_cake(self, cut: LineString) -> bool:
-        outside = cut.difference(self.exterior_shape.buffer(c.TOL * 2))
+        region = cut_region(self.exterior_shape)
+        # lines well inside need no overlay
+        if region.contains_properly(cut):
+            return True
+        outside = cut.difference(region)
         return outside.is_empty
 
     def get_cuttable_piece(self, from_p: Point, to_p: Point):
-        a_pieces = self.get_intersecting_pieces_from_point(from_p)
-        b_pieces = self.get_intersecting_pieces_from_point(to_p)
+        validated, reason = self.__find_cut(from_p, to_p)
+        if validated is None:
+            return None, reason
 
-        contenders = set(a_pieces).intersection(set(b_pieces))
+        return validated.piece, ""
+
+    def __find_cut(self, from_p: Point, to_p: Point) -> tuple[ValidatedCut | None, str]:
+        # pieces holding both points are among those holding the first one
+        contenders = [
+            piece
+            for piece in self.get_intersecting_pieces_from_point(from_p)
+            if self.get_piece_edges(piece).on_boundary(to_p.x, to_p.y, c.TOL)
+        ]
 
         if len(contenders) > 1:
-            return None, "line can cut multiple pieces, should only cut one"
+            return None, CutReason.MULTIPLE_PIECES.message
 
         if len(contenders) == 0:
-            return None, "line doesn't cut any piece of cake well"
+            return None, CutReason.NO_PIECE.message
 
-        piece = list(contenders)[0]
+        piece = contenders[0]
+        line = self.__snapped_line(piece, from_p, to_p)
 
-        # snap points to piece boundary
-        bound = piece.boundary
-        a = bound.interpolate(bound.project(from_p))
-        b = bound.interpolate(bound.project(to_p))
+        cut_pieces, reason = self.__split_well(line, piece)
+        if cut_pieces is None:
+            return None, reason
 
-        line = extend_line(LineString([a, b]))
+        return ValidatedCut(piece, from_p, to_p, line, cut_pieces), ""
 
-        piece_well_cut, reason = self.does_line_cut_piece_well(line, piece)
-        if not piece_well_cut:
-            return None, reason
+    def __snapped_line(self, piece: Polygon, from_p: Point, to_p: Point):
+        # snap points to piece boundary
+        if piece.interiors:
+            bound = piece.boundary
+            a = bound.interpolate(bound.project(from_p))
+            b = bound.interpolate(bound.project(to_p))
+        else:
+            boundary = self.get_piece_boundary(piece)
+            a = Point(boundary.snap(from_p.x, from_p.y))
+            b = Point(boundary.snap(to_p.x, to_p.y))
 
-        return piece, ""
+        # ensure that the line extends beyond the piece
+        return extend_line(LineString([a, b]))
 
-    def cut_is_valid(self, from_p: Point, to_p: Point) -> tuple[bool, str]:
-        """Check whether a cut from `from_p` to `to_p` is valid.
+    def validate_cut(
+        self, from_p: Point, to_p: Point
+    ) -> tuple[ValidatedCut | None, str]:
+        """Validate a cut from `from_p` to `to_p` without performing it.
 
-        If invalid, the method returns the reason as the second argument.
+        Returns the validated cut, which can be inspected and later passed to
+        `apply_cut`, or None together with the reason the cut is invalid.
         """
         line = LineString([from_p, to_p])
 
         if not self.__cut_is_within_cake(line):
-            return False, "cut is not within cake"
+            return None, CutReason.NOT_WITHIN_CAKE.message
 
-        cuttable_piece, reason = self.get_cuttable_piece(from_p, to_p)
+        return self.__find_cut(from_p, to_p)
 
-        if not cuttable_piece:
+    def cut_is_valid(self, from_p: Point, to_p: Point) -> tuple[bool, str]:
+        """Check whether a cut from `from_p` to `to_p` is valid.
+
+        If invalid, the method returns the reason as the second argument.
+        """
+        validated, reason = self.validate_cut(from_p, to_p)
+
+        if validated is None:
             return False, reason
 
-        return True, "valid"
+        return True, CutReason.VALID.message
 
     def does_line_cut_piece_well(self, line: LineString, piece: Polygon):
         """Checks whether line cuts piece in two valid (large enough) pieces"""
+        cut_pieces, reason = self.__split_well(line, piece)
+        return cut_pieces is not None, reason
+
+    def __split_well(
+        self, line: LineString, piece: Polygon
+    ) -> tuple[tuple[Polygon, Polygon] | None, str]:
+        # a clean crossing of one of the piece's edges settles both checks
+        # below, only lines without one need the full predicates. On convex
+        # pieces with many vertices both crossings are found by binary search.
+        coords = line.coords
+        if len(coords) == 2 and self.__owns(piece):
+            (ax, ay), (bx, by) = coords
+            many = shapely.get_num_coordinates(piece) > c.CONVEX_MIN_VERTICES
+            convex = self.get_piece_convex(piece) if many else None
+            if convex is not None and convex.is_convex:
+                if convex.chord(ax, ay, bx, by) is not None:
+                    return self.__split_in_two(line, piece)
+            elif self.get_piece_edges(piece).crosses_properly(ax, ay, bx, by):
+                return self.__split_in_two(line, piece)
+
         if piece.touches(line):
-            return False, "cut lies on piece boundary"
+            return None, CutReason.ON_BOUNDARY.message
 
         if not line.crosses(piece):
-            return False, "line does not cut through piece"
+            return None, CutReason.NOT_THROUGH_PIECE.message
+
+        return self.__split_in_two(line, piece)
+
+    def __split_in_two(
+        self, line: LineString, piece: Polygon
+    ) -> tuple[tuple[Polygon, Polygon] | None, str]:
+        # walking the ring rejects most bad cuts without shapely's overlay.
+        # The pieces of good ones still come from `split`: players play on
+        # them, and seeded games depend on their order and vertices.
+        areas = split_areas(piece, line)
+        if areas is not None:
+            if len(areas) != 2:
+                return None, f"line cuts piece in {len(areas)}, not 2"
+            if not all([area >= c.MIN_PIECE_AREA for area in areas]):
+                return None, CutReason.TOO_SMALL.message
 
         cut_pieces = split(piece, line)
         if len(cut_pieces.geoms) != 2:
-            return False, f"line cuts piece in {len(cut_pieces.geoms)}, not 2"
+            return None, f"line cuts piece in {len(cut_pieces.geoms)}, not 2"
 
         all_sizes_are_good = all([p.area >= c.MIN_PIECE_AREA for p in cut_pieces.geoms])
 
         if not all_sizes_are_good:
-            return False, "line cuts a piece that's too small"
+            return None, CutReason.TOO_SMALL.message
 
-        return True, ""
+        first, second = cast(list[Polygon], list(cut_pieces.geoms))
+        return (first, second), ""
 
-    def cut_piece(self, piece: Polygon, from_p: Point, to_p: Point):
-        bound = piece.boundary
-        a = bound.interpolate(bound.project(from_p))
-        b = bound.interpolate(bound.project(to_p))
+    def cut_is_valid_many(
+        self, from_xy: np.ndarray, to_xy: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Check many cuts at once, given as (n, 2) arrays of endpoints.
 
-        line = LineString([a, b])
-        # ensure that the line extends beyond the piece
-        line = extend_line(line)
+        Applies the same rules as `cut_is_valid`, with the cheap checks run
+        as vectorized shapely operations over all cuts. Only cuts passing them
+        are split one by one. Returns a boolean array of valid cuts and an
+        array of `CutReason` codes.
+        """
+        from_xy = np.asarray(from_xy, dtype=float).reshape(-1, 2)
+        to_xy = np.asarray(to_xy, dtype=float).reshape(-1, 2)
+        reasons = np.full(len(from_xy), CutReason.VALID, dtype=np.int8)
+
+        lines = shapely.linestrings(np.stack([from_xy, to_xy], axis=1))
+        allowed = cut_region(self.exterior_shape)
+        # lines well inside need no overlay, the rest is checked like cut_is_valid
+        unsure = np.flatnonzero(~shapely.contains_properly(allowed, lines))
+        outside = shapely.difference(lines[unsure], allowed)
+        reasons[unsure[~shapely.is_empty(outside)]] = CutReason.NOT_WITHIN_CAKE
+
+        # find the pieces whose boundaries both endpoints lie on
+        pieces = np.array(self.exterior_pieces, dtype=object)
+        bounds = shapely.boundary(pieces)
+        tree = shapely.STRtree(bounds)
+
+        def touched(xy: np.ndarray, todo: np.ndarray) -> np.ndarray:
+            x, y = xy[todo, 0], xy[todo, 1]
+            boxes = shapely.box(x - c.TOL, y - c.TOL, x + c.TOL, y + c.TOL)
+            cut_idx, piece_idx = tree.query(boxes)
+            points = shapely.points(xy[todo][cut_idx])
+            close = shapely.distance(points, bounds[piece_idx]) <= c.TOL
+            return todo[cut_idx[close]] * len(pieces) + piece_idx[close]
+
+        todo = np.flatnonzero(reasons == CutReason.VALID)
+        shared = np.intersect1d(touched(from_xy, todo), touched(to_xy, todo))
+        cut_idx, piece_idx = np.divmod(shared, len(pieces))
+
+        contenders = np.bincount(cut_idx, minlength=len(from_xy))
+        reasons[(reasons == CutReason.VALID) & (contenders == 0)] = CutReason.NO_PIECE
+        reasons[contenders > 1] = CutReason.MULTIPLE_PIECES
+
+        single = reasons[cut_idx] == CutReason.VALID
+        todo, piece_idx = cut_idx[single], piece_idx[single]
+
+        # snap the endpoints to the piece boundary and extend the line
+        piece_bounds = bounds[piece_idx]
+        a = shapely.line_interpolate_point(
+            piece_bounds,
+            shapely.line_locate_point(piece_bounds, shapely.points(from_xy[todo])),
+        )
+        b = shapely.line_interpolate_point(
+            piece_bounds,
+            shapely.line_locate_point(piece_bounds, shapely.points(to_xy[todo])),
+        )
+        snapped = extend_lines(shapely.get_coordinates(a), shapely.get_coordinates(b))
+
+        on_boundary = shapely.touches(pieces[piece_idx], snapped)
+        reasons[todo[on_boundary]] = CutReason.ON_BOUNDARY
+        crosses = shapely.crosses(snapped, pieces[piece_idx])
+        reasons[todo[~on_boundary & ~crosses]] = CutReason.NOT_THROUGH_PIECE
+
+        for i in np.flatnonzero(~on_boundary & crosses):
+            cut_pieces, reason = self.__split_in_two(snapped[i], pieces[piece_idx[i]])
+            if cut_pieces is None:
+                reasons[todo[i]] = (
+                    CutReason.TOO_SMALL
+                    if reason == CutReason.TOO_SMALL.message
+                    else CutReason.NOT_TWO_PIECES
+                )
+
+        return reasons == CutReason.VALID, reasons
+
+    def cut_piece(self, piece: Polygon, from_p: Point, to_p: Point):
+        line = self.__snapped_line(piece, from_p, to_p)
 
         split_piece = split(piece, line)
 
@@ -235,20 +797,261 @@ class Cake:
 
     def cut(self, from_p: Point, to_p: Point):
         """Perform a cut from `from_p` to `to_p` on this cake."""
-        is_valid, reason = self.cut_is_valid(from_p, to_p)
-        if not is_valid:
+        validated, reason = self.validate_cut(from_p, to_p)
+        if validated is None:
             raise Exception(f"invalid cut: {reason}")
 
-        # as this cut is valid, we will have exactly one cuttable piece
-        target_piece, _ = self.get_cuttable_piece(from_p, to_p)
-        assert target_piece is not None
+        self.apply_cut(validated)
+
+    def apply_cut(self, validated: ValidatedCut):
+        """Perform a cut previously returned by `validate_cut`."""
+        if not self.__owns(validated.piece):
+            raise Exception("invalid cut: piece was already cut")
+
+        self.__replace_piece(validated)
 
-        split_pieces = self.cut_piece(target_piece, from_p, to_p)
+    def __replace_piece(self, validated: ValidatedCut):
+        """Swap out the cut piece for the pieces cut from it, updating indexes."""
+        self.__unshare()
 
-        # swap out old piece with the two smaller pieces we just cut from it
+        target_piece, split_pieces = validated.piece, list(validated.pieces)
         target_idx = self.exterior_pieces.index(target_piece)
         self.exterior_pieces.pop(target_idx)
         self.exterior_pieces.extend(split_pieces)
+        self._array = None
+
+        if self._owned is not None:
+            del self._owned[id(target_piece)]
+            for piece in split_pieces:
+                self._owned[id(piece)] = piece
+
+        if self._index is not None:
+            if (
+                4 * self.exterior_shape.area
+                < len(self._pieces) * self._index.cell_size**2
+            ):
+                # the pieces outgrew the cells, rebuild it finer
+                self._index = None
+                self.get_piece_index()
+            else:
+                self.__unindex_piece(target_piece)
+                for piece in split_pieces:
+                    self.__index_piece(piece)
+
+        self._boundaries.pop(id(target_piece), None)
+        self._edges.pop(id(target_piece), None)
+        self._convex.pop(id(target_piece), None)
+        record = self._records.pop(id(target_piece), None)
+        moments = None
+        if self._stats is not None:
+            moments = self._stats.count, self._stats.mean, self._stats.m2
+            record = record or self.get_piece_record(target_piece)
+            self._stats.remove(record)
+            for piece in split_pieces:
+                self._stats.add(self.get_piece_record(piece))
+
+        tags = None
+        if self._order is not None:
+            tags = self._order.remove(target_piece)
+            for piece in split_pieces:
+                self._order.add(self.get_piece_record(piece))
+
+        if self._adjacency is not None:
+            self._adjacency.replace(
+                [id(target_piece)], [id(piece) for piece in split_pieces]
+            )
+
+        self._lineage.add(CutRecord(validated, target_idx))
+
+        if self._journal is not None:
+            self._journal.append(
+                _JournalEntry(
+                    target_piece, target_idx, split_pieces, record, moments, tags
+                )
+            )
+
+    def __undo(self, entry: _JournalEntry):
+        """Put back the piece replaced by the cut recorded in `entry`."""
+        self.__unshare()
+
+        # later cuts were undone already, so the split pieces are the last ones
+        del self.exterior_pieces[-len(entry.pieces) :]
+        self.exterior_pieces.insert(entry.index, entry.piece)
+        self._array = None
+
+        if self._owned is not None:
+            for piece in entry.pieces:
+                del self._owned[id(piece)]
+            self._owned[id(entry.piece)] = entry.piece
+
+        if self._index is not None:
+            for piece in entry.pieces:
+                self.__unindex_piece(piece)
+            self.__index_piece(entry.piece)
+
+        for piece in entry.pieces:
+            self._boundaries.pop(id(piece), None)
+            self._edges.pop(id(piece), None)
+            self._convex.pop(id(piece), None)
+        records = [self._records.pop(id(piece), None) for piece in entry.pieces]
+        if entry.record is not None:
+            self._records[id(entry.piece)] = entry.record
+
+        if self._stats is not None:
+            for piece, record in zip(entry.pieces, records):
+                self._stats.remove(record or self.get_piece_record(piece))
+            self._stats.add(entry.record or self.get_piece_record(entry.piece))
+            if entry.moments is not None:
+                # restore exactly, rather than trusting the reversed updates
+                self._stats.count, self._stats.mean, self._stats.m2 = entry.moments
+
+        if self._order is not None:
+            for piece in entry.pieces:
+                self._order.remove(piece)
+            self._order.add(
+                entry.record or self.get_piece_record(entry.piece), entry.tags
+            )
+
+        if self._adjacency is not None:
+            self._adjacency.replace(
+                [id(piece) for piece in entry.pieces], [id(entry.piece)]
+            )
+
+        self._lineage.pop()
+
+    def savepoint(self) -> int:
+        """Mark the current state of the cake so later cuts can be rolled back.
+
+        Savepoints nest: rolling back to one also discards all savepoints
+        taken after it. Returns a handle for `rollback` and `release`.
+        """
+        if self._journal is None:
+            self._journal = []
+        self._savepoints.append(len(self._journal))
+        return len(self._savepoints) - 1
+
+    def rollback(self, savepoint: int):
+        """Undo all cuts made since `savepoint`, which stays active."""
+        assert self._journal is not None and savepoint < len(self._savepoints)
+
+        mark = self._savepoints[savepoint]
+        while len(self._journal) > mark:
+            self.__undo(self._journal.pop())
+        del self._savepoints[savepoint + 1 :]
+
+    def release(self, savepoint: int):
+        """Keep the cuts made since `savepoint` and stop tracking it."""
+        assert self._journal is not None and savepoint < len(self._savepoints)
+
+        del self._savepoints[savepoint:]
+        if not self._savepoints:
+            self._journal = None
+
+    @contextmanager
+    def what_if(self):
+        """Context in which cuts can be tried out, undone again on exit."""
+        savepoint = self.savepoint()
+        try:
+            yield self
+        finally:
+            self.rollback(savepoint)
+            self.release(savepoint)
+
+    def get_cut_tree(self) -> CutTree:
+        """The cuts made on this cake so far, and which piece each of them split."""
+        return self._lineage
+
+    def recut(self, cut: int, from_p: Point, to_p: Point) -> list[int]:
+        """Move cut number `cut` (counting from 0 in cut order) to new endpoints.
+
+        Only the cuts made on pieces descending from the moved cut are
+        validated and performed again, from their original endpoints. Later
+        cuts elsewhere on the cake are put back as they were. Returns the
+        numbers of the descending cuts that are no longer valid and were
+        dropped. Raises, leaving the cake as it was, if the moved cut is
+        invalid or lands on another piece.
+        """
+        if self._savepoints:
+            raise Exception("cannot recut while savepoints are active")
+
+        lineage = self._lineage
+        undone = lineage.cuts[cut:]
+        subtree = set(lineage.subtree(cut))
+        tags = {}
+        if self._order is not None:
+            for record in undone:
+                for piece in record.cut.pieces:
+                    if self.__owns(piece):
+                        tags[id(piece)] = self._order.get_tags(piece)
+
+        for record in reversed(undone):
+            validated = record.cut
+            self.__undo(
+                _JournalEntry(
+                    validated.piece,
+                    record.index,
+                    list(validated.pieces),
+                    None,
+                    None,
+                    None,
+                )
+            )
+
+        moved, reason = self.validate_cut(from_p, to_p)
+        if moved is None or moved.piece is not undone[0].cut.piece:
+            for record in undone:
+                self.apply_cut(record.cut)
+            self.__restore_tags(tags)
+            raise Exception(f"invalid cut: {reason or 'cut lands on another piece'}")
+        self.apply_cut(moved)
+
+        # descendants of the moved cut may only cut pieces descending from it
+        moved_pieces = {id(piece) for piece in moved.pieces}
+        dropped = []
+        for k, record in enumerate(undone[1:], cut + 1):
+            if k not in subtree:
+                self.apply_cut(record.cut)
+                continue
+            validated, _ = self.validate_cut(record.cut.from_p, record.cut.to_p)
+            if validated is None or id(validated.piece) not in moved_pieces:
+                dropped.append(k)
+                continue
+            self.apply_cut(validated)
+            moved_pieces.remove(id(validated.piece))
+            moved_pieces.update(id(piece) for piece in validated.pieces)
+
+        self.__restore_tags(tags)
+        return dropped
+
+    def __restore_tags(self, tags: dict[int, dict[str, float]]):
+        """Tag again the pieces that are still there, after `recut`."""
+        if self._order is None:
+            return
+        for piece in self.exterior_pieces:
+            if tags.get(id(piece)):
+                self._order.set_tags(piece, **tags[id(piece)])
+
+    def replay(self, cuts: list[tuple[Point, Point]]) -> list[int]:
+        """Perform `cuts`, each as soon as a piece it cuts well exists.
+
+        Cuts are tried in the given order, and those that are not valid yet
+        (e.g. because the piece they cut comes from a later cut) are retried
+        after every successful pass. Returns the positions of the cuts that
+        never became valid.
+        """
+        pending = list(range(len(cuts)))
+        while pending:
+            deferred = []
+            for i in pending:
+                validated, _ = self.validate_cut(*cuts[i])
+                if validated is None:
+                    deferred.append(i)
+                else:
+                    self.apply_cut(validated)
+            if len(deferred) == len(pending):
+                break
+            pending = deferred
+        return pending
 
     def get_boundary_points(self) -> list[Point]:
         """Get a list of all boundary points in a (crust, interior) tuple."""
@@ -272,8 +1075,7 @@ class Cake:
         return self.exterior_pieces
 
     def pieces_are_even(self):
-        areas = [p.area for p in self.exterior_pieces]
-        return max(areas) - min(areas) <= c.PIECE_SPAN_TOL
+        return self.get_size_span() <= c.PIECE_SPAN_TOL
 
     def get_angles(self):
         return get_polygon_angles(self.exterior_shape)
@@ -0,0 +1,104 @@
+import heapq
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from shapely import Polygon
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Candidate[T]:
+    """A scored candidate cut on `piece`, lower scores are better."""
+
+    score: float
+    piece: Polygon
+    cut: T
+
+
+class CandidateStore[T]:
+    """Scored candidate cuts of all pieces, maintained across cuts.
+
+    A cut replaces a single piece by two, so the candidates on all other
+    pieces keep their scores. `refresh` compares the current pieces with the
+    known ones (by identity, like `Cake` does), drops the candidates of
+    pieces that are gone and calls `generate` only for new pieces. The best
+    candidate over all pieces is kept in a heap, stale entries are skipped
+    when they reach the top.
+
+    `generate(piece)` returns `(score, cut)` pairs, where `cut` is anything
+    the caller needs to perform the cut later, e.g. its endpoints.
+    """
+
+    def __init__(self, generate: Callable[[Polygon], Iterable[tuple[float, T]]]):
+        self.generate = generate
+        # id(piece) -> (piece, generation, candidates of the piece)
+        self.__pieces: dict[int, tuple[Polygon, int, list[Candidate[T]]]] = {}
+        self.__heap: list[tuple[float, int, int, Candidate[T]]] = []
+        self.__generation = 0
+        self.__counter = 0
+        self.__live = 0
+
+    def __len__(self) -> int:
+        return self.__live
+
+    def refresh(self, pieces: Iterable[Polygon]):
+        """Bring the store up to date with `pieces`, e.g. `cake.get_pieces()`."""
+        current = {id(piece): piece for piece in pieces}
+
+        for key in list(self.__pieces):
+            piece, _, candidates = self.__pieces[key]
+            if current.get(key) is not piece:
+                del self.__pieces[key]
+                self.__live -= len(candidates)
+
+        for key, piece in current.items():
+            if key not in self.__pieces:
+                self.__add(piece)
+
+        # drop stale entries once they make up most of the heap
+        if len(self.__heap) > 2 * self.__live + 64:
+            self.__heap = [entry for entry in self.__heap if self.__is_live(entry)]
+            heapq.heapify(self.__heap)
+
+    def __add(self, piece: Polygon):
+        self.__generation += 1
+        candidates = [
+            Candidate(score, piece, cut) for score, cut in self.generate(piece)
+        ]
+        self.__pieces[id(piece)] = (piece, self.__generation, candidates)
+        self.__live += len(candidates)
+
+        for candidate in candidates:
+            # the counter breaks ties, so candidates themselves are never compared
+            self.__counter += 1
+            heapq.heappush(
+                self.__heap,
+                (candidate.score, self.__counter, self.__generation, candidate),
+            )
+
+    def __is_live(self, entry: tuple[float, int, int, Candidate[T]]) -> bool:
+        _, _, generation, candidate = entry
+        known = self.__pieces.get(id(candidate.piece))
+        return known is not None and known[1] == generation
+
+    def best(self) -> Candidate[T] | None:
+        """The best candidate over all pieces, or None if there are none."""
+        heap = self.__heap
+        while heap and not self.__is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][3] if heap else None
+
+    def pop(self) -> Candidate[T] | None:
+        """Remove and return the best candidate, e.g. if it turned out unusable."""
+        best = self.best()
+        if best is not None:
+            heapq.heappop(self.__heap)
+            self.__pieces[id(best.piece)][2].remove(best)
+            self.__live -= 1
+        return best
+
+    def candidates(self, piece: Polygon) -> list[Candidate[T]]:
+        """The candidates of `piece`, which must be known to the store."""
+        known, _, candidates = self.__pieces[id(piece)]
+        if known is not piece:
+            raise KeyError("piece is not known to the store")
+        return candidates
@@ -0,0 +1,300 @@
+"""Areas cut off by all chords between sample points of a piece's boundary.
+
+The boundary is sampled at `K` points, and every pair of samples is a
+candidate cut. Walking the boundary from sample `i` to sample `j` and back
+along the chord encloses one of the two parts the chord cuts the piece
+into, and by the shoelace formula its area is a difference of prefix sums
+along the boundary plus the chord's own cross term. So all K² areas follow
+from O(K) prefix sums in O(K²) arithmetic, without splitting anything.
+
+The interior (non-crust) area of a part follows the same way from clipping
+the piece's interior against the chord's half-plane.
+"""
+
+import numpy as np
+import shapely
+from shapely import Point, Polygon
+from shapely.geometry.base import BaseGeometry
+
+from src.halfplane import halfplane_areas_paired, polygon_rings
+
+# upper bound on the elements of the temporary (chords, edges) arrays
+_CHUNK = 1 << 21
+
+# cross products below this (relative to the piece's size) count as zero
+_COLLINEAR_TOL = 1e-12
+
+# fraction of its length by which `extend_line` extends a cut at both ends
+_EXTENSION = 0.05
+
+
+def _signs(values: np.ndarray, tol: float) -> np.ndarray:
+    """-1, 0 or 1 for values below, within or above the tolerance band."""
+    return (values > tol).view(np.int8) - (values < -tol).view(np.int8)
+
+
+class ChordAreas:
+    """Area on one side of every chord between `samples` boundary points.
+
+    Samples are spaced evenly along the exterior ring, starting at its first
+    vertex, i.e. at `piece.boundary.interpolate(i * length / samples)`.
+    `areas[i, j]` is the area of the part bounded by the boundary from
+    sample `i` to sample `j` (in the ring's direction) and the chord back,
+    so `areas[j, i] == total - areas[i, j]`.
+
+    `valid[i, j]` is True where cutting along the chord, extended the way
+    `Cake` extends cuts, splits the piece into exactly two parts. Chords
+    running along the boundary, leaving the piece or crossing it more than
+    once are invalid. Pieces with holes are not supported.
+
+    Given the cake's `interior_shape`, the piece's share of it is clipped
+    once, and `interior_areas` gives the crust ratio side of many chords at
+    about the cost of their areas.
+    """
+
+    def __init__(
+        self, piece: Polygon, samples: int, interior: BaseGeometry | None = None
+    ):
+        if piece.interiors:
+            raise ValueError("ChordAreas needs a piece without holes")
+
+        ring = shapely.get_coordinates(piece.exterior)
+        # work relative to the first vertex to keep the numbers small
+        self.origin = ring[0]
+        xy = ring - self.origin
+        edges = np.diff(xy, axis=0)
+
+        lengths = np.hypot(edges[:, 0], edges[:, 1])
+        along = np.concatenate([[0.0], np.cumsum(lengths)])
+        distances = np.arange(samples) * (along[-1] / samples)
+        edge = np.clip(np.searchsorted(along, distances, side="right") - 1, 0, None)
+        edge = np.minimum(edge, len(edges) - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(
+                lengths[edge] > 0, (distances - along[edge]) / lengths[edge], 0.0
+            )
+        points = xy[edge] + frac[:, None] * edges[edge]
+
+        # twice the signed area swept from the first vertex along the ring up
+        # to each sample
+        crosses = xy[:-1, 0] * xy[1:, 1] - xy[:-1, 1] * xy[1:, 0]
+        prefix = np.concatenate([[0.0], np.cumsum(crosses)])
+        start = xy[edge]
+        swept = prefix[edge] + start[:, 0] * points[:, 1] - start[:, 1] * points[:, 0]
+
+        # normalize to counter-clockwise, so enclosed areas come out positive
+        sign = 1.0 if prefix[-1] >= 0 else -1.0
+        self.total = abs(prefix[-1]) / 2
+
+        x, y = points[:, 0], points[:, 1]
+        closing = x[:, None] * y[None, :] - y[:, None] * x[None, :]
+        raw = sign * (swept[None, :] - swept[:, None] - closing) / 2
+        # from a later sample the walk wraps around past the first vertex
+        self.areas = raw + np.tril(np.full((samples, samples), self.total), -1)
+
+        self.piece = piece
+        self.__ring = ring
+        self.points = points + self.origin
+        self.edge = edge
+        self.frac = frac
+        self.orientation = sign
+
+        # the side of vertex v relative to chord (i, j) is
+        # (p_j - p_i) x (v - p_i) = p_j x v - p_i x v + p_i x p_j
+        self.__to_vertex = x[:, None] * xy[:, 1] - y[:, None] * xy[:, 0]
+        self.__closing = closing
+        self.__tol = _COLLINEAR_TOL * max(np.abs(xy).max(), 1.0) ** 2
+        self.valid = self.__valid(xy, points)
+
+        # the piece's share of the cake interior, clipped once for all chords
+        self.interior = piece.intersection(interior) if interior is not None else None
+        self.__interior_rings = (
+            polygon_rings(self.interior) if self.interior is not None else []
+        )
+
+    def __incident(self, k: np.ndarray) -> np.ndarray:
+        """The edges sample(s) `k` lie on, both edges if at a vertex."""
+        n_edges = len(self.__to_vertex[0]) - 1
+        e, f = self.edge[k], self.frac[k]
+        before = np.where(f <= _COLLINEAR_TOL, (e - 1) % n_edges, e)
+        after = np.where(f >= 1 - _COLLINEAR_TOL, (e + 1) % n_edges, e)
+        return np.stack([e, before, after], axis=1)
+
+    def __vertex_sides(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Sides of all vertices relative to the lines through chords (i, j)."""
+        to_vertex = self.__to_vertex
+        return _signs(
+            to_vertex[j] - to_vertex[i] + self.__closing[i, j, None], self.__tol
+        )
+
+    def __valid(self, xy: np.ndarray, points: np.ndarray) -> np.ndarray:
+        samples = len(points)
+        n_edges = len(xy) - 1
+        valid = np.zeros((samples, samples), dtype=bool)
+
+        i, j = np.triu_indices(samples, 1)
+        area_tol = _COLLINEAR_TOL * max(self.total, 1.0)
+        area = self.areas[i, j]
+        keep = (area > area_tol) & (area < self.total - area_tol)
+        i, j = i[keep], j[keep]
+
+        # both side tests of segment intersection come from per-sample tables,
+        # the side of a point relative to an edge is affine in the point,
+        # which gives it for the ends of the extended chords as well
+        e0, d = xy[:-1], np.diff(xy, axis=0)
+        to_edge = d[:, 0] * (points[:, None, 1] - e0[:, 1]) - d[:, 1] * (
+            points[:, None, 0] - e0[:, 0]
+        )
+        tol = self.__tol
+        edge_signs = _signs(to_edge, tol)
+
+        def contacts(vertex_sides, start, end, skip):
+            """Edges properly crossed by a segment, and whether it touches any."""
+            edge_sides = vertex_sides[:, :-1] * vertex_sides[:, 1:]
+            end_sides = start * end
+            meets = (edge_sides <= 0) & (end_sides <= 0)
+            meets[np.arange(len(meets))[:, None], skip] = False
+            crosses = meets & (edge_sides < 0) & (end_sides < 0)
+            return crosses.sum(axis=1), (meets & ~crosses).any(axis=1)
+
+        good = np.zeros(len(i), dtype=bool)
+        step = max(1, _CHUNK // (n_edges + 1))
+        for lo in range(0, len(i), step):
+            ci, cj = i[lo : lo + step], j[lo : lo + step]
+            # a chord may only meet the boundary on the edges it starts and
+            # ends on
+            skip_i, skip_j = self.__incident(ci), self.__incident(cj)
+            vertex_sides = self.__vertex_sides(ci, cj)
+            at_i, at_j = to_edge[ci], to_edge[cj]
+            sides_i, sides_j = edge_signs[ci], edge_signs[cj]
+
+            crossings, touches = contacts(
+                vertex_sides, sides_i, sides_j, np.concatenate([skip_i, skip_j], axis=1)
+            )
+            ok = (crossings == 0) & ~touches
+
+            # `Cake` extends cuts at both ends. An extension leaving the piece
+            # may re-enter it and end inside, but cutting off another part
+            # makes the cut invalid. If it ends inside without crossing the
+            # boundary, it started out inside the piece at a reflex vertex,
+            # which is rejected as well.
+            for k, other, start, end, skip in (
+                (ci, cj, sides_i, at_i + _EXTENSION * (at_i - at_j), skip_i),
+                (cj, ci, sides_j, at_j + _EXTENSION * (at_j - at_i), skip_j),
+            ):
+                crossings, touches = contacts(
+                    vertex_sides, start, _signs(end, tol), skip
+                )
+                tip = self.points[k] + _EXTENSION * (
+                    self.points[k] - self.points[other]
+                )
+                inside = shapely.contains_xy(self.piece, tip[:, 0], tip[:, 1])
+                ok &= ~touches & np.where(inside, crossings == 1, crossings == 0)
+
+            good[lo : lo + step] = ok
+
+        valid[i, j] = good
+        valid[j, i] = good
+        return valid
+
+    def endpoints(self, i: int, j: int) -> tuple[Point, Point]:
+        """The boundary points of chord (i, j), e.g. to pass on to `Cake.cut`."""
+        return Point(self.points[i]), Point(self.points[j])
+
+    def closest(self, target: float, n: int = 1) -> np.ndarray:
+        """The `n` valid chords cutting off a part closest to `target` in area.
+
+        Returns an (m, 2) array of sample index pairs, m <= n, ordered by
+        increasing error. A pair (i, j) cuts off `areas[i, j]` on the side
+        closer to the target.
+        """
+        error = np.abs(self.areas - target)
+        error[~self.valid] = np.inf
+        # every chord appears twice, once per side, keep the better side
+        error = np.minimum(error, error.T)
+        error[np.tril_indices(len(error))] = np.inf
+
+        flat = error.ravel()
+        count = min(n, int(np.isfinite(flat).sum()))
+        if count == 0:
+            return np.zeros((0, 2), dtype=int)
+
+        best = np.argpartition(flat, count - 1)[:count]
+        best = best[np.argsort(flat[best], kind="stable")]
+        i, j = np.divmod(best, len(error))
+
+        # point each pair at the side that is closer to the target
+        swap = np.abs(self.areas[i, j] - target) > np.abs(self.areas[j, i] - target)
+        return np.where(
+            swap[:, None], np.stack([j, i], axis=1), np.stack([i, j], axis=1)
+        )
+
+    def interior_areas(self, pairs) -> np.ndarray:
+        """Interior (non-crust) area of the part `areas[i, j]` for each pair.
+
+        `pairs` is an (m, 2) array of sample indices, e.g. from `closest()`.
+        Needs the `interior` passed to the constructor. If the line through a
+        chord meets the piece only along the chord, the part is the piece's
+        intersection with a half-plane, and all of those are clipped in one
+        vectorized pass over the interior. For the other chords the parts are
+        built from the boundary and intersected with the interior in a single
+        vectorized shapely call. Invalid chords give nan.
+        """
+        if self.interior is None:
+            raise ValueError("ChordAreas was created without an interior")
+
+        pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+        i, j = pairs[:, 0], pairs[:, 1]
+        result = np.full(len(pairs), np.nan)
+        if not len(pairs):
+            return result
+
+        # the line meets the boundary elsewhere if any edge other than the
+        # chord's own has vertices on both sides of (or on) it
+        vertex_sides = self.__vertex_sides(i, j)
+        meets = vertex_sides[:, :-1] * vertex_sides[:, 1:] <= 0
+        rows = np.arange(len(pairs))[:, None]
+        meets[rows, self.__incident(i)] = False
+        meets[rows, self.__incident(j)] = False
+        clean = self.valid[i, j] & ~meets.any(axis=1)
+
+        # walking from sample i to sample j and back along the chord encloses
+        # the part counter-clockwise (after normalizing), so it lies left of
+        # the chord from p_j to p_i
+        u = self.points[i[clean]] - self.points[j[clean]]
+        normal = self.orientation * np.stack([u[:, 1], -u[:, 0]], axis=1)
+        normal /= np.hypot(normal[:, 0], normal[:, 1])[:, None]
+        angles = np.arctan2(normal[:, 1], normal[:, 0])
+        offsets = np.einsum("ij,ij->i", self.points[j[clean]], normal)
+        result[clean] = halfplane_areas_paired(self.__interior_rings, angles, offsets)
+
+        # the rest is intersected with the parts as polygons, all at once
+        rest = np.flatnonzero(self.valid[i, j] & ~clean)
+        if len(rest):
+            parts = [self.__part_coords(i[k], j[k]) for k in rest]
+            rings = shapely.linearrings(
+                np.concatenate(parts),
+                indices=np.repeat(np.arange(len(parts)), [len(p) for p in parts]),
+            )
+            shapely.prepare(self.interior)
+            result[rest] = shapely.area(
+                shapely.intersection(shapely.polygons(rings), self.interior)
+            )
+
+        return result
+
+    def part(self, i: int, j: int) -> Polygon:
+        """The part of the piece with area `areas[i, j]`."""
+        return Polygon(self.__part_coords(i, j))
+
+    def __part_coords(self, i: int, j: int) -> np.ndarray:
+        # the boundary from sample i to sample j, wrapping past the first vertex
+        # if needed, and the chord back
+        ring = self.__ring
+        if i < j:
+            between = ring[self.edge[i] + 1 : self.edge[j] + 1]
+        else:
+            between = np.concatenate(
+                [ring[self.edge[i] + 1 : -1], ring[: self.edge[j] + 1]]
+            )
+        return np.concatenate([self.points[[i]], between, self.points[[j, i]]])
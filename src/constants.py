@@ -26,3 +26,18 @@ MAX_PIECE_AREA_PER_CHILD = 50
 # CONSTANTS
 TOL = 1e-5
 PIECE_SPAN_TOL = 0.5
+# boundaries within this distance touch; a point within TOL of two pieces
+# puts them within 2 * TOL, the rest is margin for rounding
+PIECE_CONTACT_TOL = 3 * TOL
+
+# PERFORMANCE
+# cakes with fewer pieces look up endpoints by scanning all of them: below
+# about this many, keeping the index up to date costs a cut more than its
+# lookups save (see benchmarks/piece_lookup.py)
+PIECE_INDEX_MIN_PIECES = 32
+
+# convex pieces with more vertices are checked for a clean cut by binary
+# search, which is slower than the edge index on smaller ones
+# (see benchmarks/convex_chord.py). The convex cakes in cakes/ have at most
+# nine vertices, so their pieces never get there.
+CONVEX_MIN_VERTICES = 192
@@ -0,0 +1,163 @@
+from bisect import bisect_right
+from math import atan2, pi, sqrt
+
+import shapely
+from shapely import Polygon
+
+# turns against the ring's orientation up to this much (relative to the
+# edge lengths) still count as convex, e.g. at vertices created by a cut
+_CONVEX_TOL = 1e-9
+
+# distance (relative to the shape's size) a vertex needs from the cut line
+# for the crossing to count as clear
+_CLEAR_TOL = 1e-9
+
+# (edge index, fraction along the edge, x, y) of a boundary crossing
+Crossing = tuple[int, float, float, float]
+
+
+class ConvexPiece:
+    """Convexity of a piece, and the queries it makes cheap.
+
+    The edge directions of a convex ring turn monotonically, so the vertex
+    furthest in any direction is found by a binary search over the edge
+    angles, and a line crosses the ring exactly twice, once on either chain
+    between its extreme vertices. Both crossings are again found by binary
+    search. The queries require `is_convex`.
+    """
+
+    def __init__(self, piece: Polygon):
+        self.piece = piece
+        self.__convex: bool | None = None
+
+    @property
+    def is_convex(self) -> bool:
+        if self.__convex is None:
+            self.__convex = self.__build()
+        return self.__convex
+
+    def __build(self) -> bool:
+        piece = self.piece
+        if piece.interiors:
+            return False
+        self.points = points = shapely.get_coordinates(piece.exterior).tolist()[:-1]
+        n = len(points)
+        if n < 3:
+            return False
+
+        edges = [
+            (points[(k + 1) % n][0] - x, points[(k + 1) % n][1] - y)
+            for k, (x, y) in enumerate(points)
+        ]
+        lengths = [sqrt(ex * ex + ey * ey) for ex, ey in edges]
+        if not all(lengths):
+            return False
+
+        # mirroring clockwise rings (y -> -y) makes every ring turn left
+        self.__sign = sign = 1 if piece.exterior.is_ccw else -1
+        for k in range(n):
+            (px, py), (ex, ey) = edges[k - 1], edges[k]
+            turn = sign * (px * ey - py * ex)
+            if turn < -_CONVEX_TOL * lengths[k - 1] * lengths[k]:
+                return False
+
+        # edge angles, unwrapped to increase from the first edge
+        angles = [atan2(sign * ey, ex) for ex, ey in edges]
+        for k in range(1, n):
+            if angles[k] < angles[k - 1] - pi:
+                angles[k] += 2 * pi
+            angles[k] = max(angles[k], angles[k - 1])
+        self.__angles = angles
+        return True
+
+    def extreme(self, dx: float, dy: float) -> int:
+        """Index of a vertex maximizing the dot product with (dx, dy)."""
+        angles, points = self.__angles, self.points
+        n = len(points)
+
+        # the extreme vertex starts the first edge turning away from (dx, dy)
+        target = atan2(self.__sign * dy, dx) + pi / 2
+        target = angles[0] + (target - angles[0]) % (2 * pi)
+        k = bisect_right(angles, target) % n
+
+        # rounding in the angles can put the search one vertex off
+        return max(
+            ((k - 1) % n, k, (k + 1) % n),
+            key=lambda i: dx * points[i][0] + dy * points[i][1],
+        )
+
+    def projection_bounds(self, dx: float, dy: float) -> tuple[float, float]:
+        """Smallest and largest dot product of the vertices with (dx, dy)."""
+        points = self.points
+        lo, hi = points[self.extreme(-dx, -dy)], points[self.extreme(dx, dy)]
+        return dx * lo[0] + dy * lo[1], dx * hi[0] + dy * hi[1]
+
+    def crossings(
+        self, ax: float, ay: float, bx: float, by: float
+    ) -> tuple[Crossing, Crossing] | None:
+        """Where the line through a and b crosses the ring, by edge index.
+
+        Returns None unless the line clearly passes through the piece, away
+        from its vertices.
+        """
+        points = self.points
+        n = len(points)
+        dx, dy = bx - ax, by - ay
+
+        def side(i: int) -> float:
+            x, y = points[i % n]
+            return dx * (y - ay) - dy * (x - ax)
+
+        minx, miny, maxx, maxy = self.piece.bounds
+        extent = max(abs(minx - ax), abs(maxx - ax), abs(miny - ay), abs(maxy - ay))
+        tol = _CLEAR_TOL * sqrt(dx * dx + dy * dy) * max(extent, 1.0)
+
+        # the vertices furthest on either side of the line, the side changes
+        # sign once on each chain between them
+        top, bottom = self.extreme(-dy, dx), self.extreme(dy, -dx)
+        if side(top) <= tol or side(bottom) >= -tol:
+            return None
+
+        def last(start: int, stop: int, keep) -> int:
+            # last vertex after `start` (and before `stop`) keeping the sign
+            lo, hi = 0, (stop - start) % n
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if keep(side(start + mid)):
+                    lo = mid
+                else:
+                    hi = mid
+            return (start + lo) % n
+
+        result = []
+        for edge in (
+            last(top, bottom, lambda s: s > 0),
+            last(bottom, top, lambda s: s < 0),
+        ):
+            here, there = side(edge), side(edge + 1)
+            if min(abs(here), abs(there)) <= tol or (here > 0) == (there > 0):
+                return None
+            frac = here / (here - there)
+            (x0, y0), (x1, y1) = points[edge], points[(edge + 1) % n]
+            result.append((edge, frac, x0 + frac * (x1 - x0), y0 + frac * (y1 - y0)))
+
+        first, second = sorted(result)
+        return first, second
+
+    def chord(
+        self, ax: float, ay: float, bx: float, by: float
+    ) -> tuple[Crossing, Crossing] | None:
+        """`crossings`, if the segment from a to b spans both of them.
+
+        Such a segment enters the piece and leaves it again, so it cuts the
+        piece in exactly two.
+        """
+        crossings = self.crossings(ax, ay, bx, by)
+        if crossings is None:
+            return None
+        dx, dy = bx - ax, by - ay
+        length2 = dx * dx + dy * dy
+        for _, _, x, y in crossings:
+            if not 0 < ((x - ax) * dx + (y - ay) * dy) / length2 < 1:
+                return None
+        return crossings
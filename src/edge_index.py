@@ -0,0 +1,216 @@
+from math import ceil, sqrt
+
+import shapely
+from shapely import Point, Polygon
+
+from src.spatial import PieceGrid
+
+# pieces with up to this many edges are scanned instead of gridded
+_SCAN_EDGES = 16
+
+# crossing queries on larger pieces left to the caller before their index is
+# built, building it pays off only for pieces queried repeatedly
+_QUERIES_BEFORE_BUILD = 32
+
+# relative tolerance for a crossing to count as clear of vertices and ends
+_PROPER_TOL = 1e-9
+
+# hits closer than this (along the segment, relative to its length) merge
+_MERGE_TOL = 1e-12
+
+
+def segment_distance(
+    x: float, y: float, x0: float, y0: float, x1: float, y1: float
+) -> float:
+    """Distance from (x, y) to the segment (x0, y0)-(x1, y1), computed like GEOS."""
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    r = ((x - x0) * dx + (y - y0) * dy) / length2 if length2 else 0.0
+    if r <= 0:
+        return sqrt((x - x0) * (x - x0) + (y - y0) * (y - y0))
+    if r >= 1:
+        return sqrt((x - x1) * (x - x1) + (y - y1) * (y - y1))
+    s = ((y0 - y) * dx - (x0 - x) * dy) / length2
+    return abs(s) * sqrt(length2)
+
+
+class EdgeIndex:
+    """Uniform grid over the edges of a piece, exterior and holes alike.
+
+    Segment queries only look at the edges registered in the grid cells the
+    segment passes through, so their cost depends on the edges near the
+    segment instead of all edges of the piece. Small pieces skip the grid
+    and scan their few edges directly. Nothing is built before it is
+    needed, and `on_boundary` and `crosses_properly` avoid building the
+    index of a larger piece that is only queried a few times.
+
+    Segments are given by their end points a and b, and positions along
+    them as the parameter t, 0 at a and 1 at b.
+    """
+
+    def __init__(self, piece: Polygon):
+        self.piece = piece
+        self.__grid: PieceGrid | None = None
+        self.__edges: list[tuple[float, float, float, float]] | None = None
+        self.__queries = 0
+
+    def __get_edges(self) -> list[tuple[float, float, float, float]]:
+        if self.__edges is not None:
+            return self.__edges
+
+        piece = self.piece
+        edges = []
+        for ring in [piece.exterior, *piece.interiors]:
+            coords = shapely.get_coordinates(ring).tolist()
+            edges += [(*p, *q) for p, q in zip(coords, coords[1:])]
+        self.__edges = edges
+
+        if len(edges) > _SCAN_EDGES:
+            grid = PieceGrid(piece.bounds, ceil(sqrt(len(edges))))
+            for k, (x0, y0, x1, y1) in enumerate(edges):
+                grid.insert(k, (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+            self.__grid = grid
+            self.__margin = 1e-9 * grid.cell_size
+        return edges
+
+    def edges(self) -> list[tuple[float, float, float, float]]:
+        """All edges (x0, y0, x1, y1), exterior first, then the holes."""
+        return self.__get_edges()
+
+    def edges_near_segment(
+        self, ax: float, ay: float, bx: float, by: float, tol: float = 0.0
+    ):
+        """The edges (x0, y0, x1, y1) that may lie within `tol` of the segment."""
+        edges = self.__get_edges()
+        if self.__grid is None:
+            return edges
+        keys = self.__grid.query_segment(ax, ay, bx, by, tol + self.__margin)
+        return [edges[k] for k in sorted(keys)]
+
+    def edges_near_point(self, x: float, y: float, tol: float = 0.0):
+        """The edges (x0, y0, x1, y1) that may lie within `tol` of (x, y)."""
+        edges = self.__get_edges()
+        if self.__grid is None:
+            return edges
+        keys = self.__grid.query_point(x, y, tol + self.__margin)
+        return [edges[k] for k in sorted(keys)]
+
+    def on_boundary(self, x: float, y: float, tol: float) -> bool:
+        """Whether (x, y) lies within `tol` of the boundary.
+
+        Same as `Point(x, y).distance(piece.boundary) <= tol`, which is also
+        what is asked unless the grid is built already: GEOS is no slower
+        than scanning the edges in Python.
+        """
+        if self.__grid is None:
+            return Point(x, y).distance(self.piece.boundary) <= tol
+        return any(
+            segment_distance(x, y, *edge) <= tol
+            for edge in self.edges_near_point(x, y, tol)
+        )
+
+    def crossings(self, ax: float, ay: float, bx: float, by: float) -> int:
+        """How often the open segment from a to b crosses the boundary.
+
+        Edges are counted when their ends lie on different sides of the
+        segment's line, with points on the line counting as one side, so a
+        segment passing through a vertex counts once and one just touching
+        it counts twice or not at all. The parity tells whether a and b lie
+        on different sides of the boundary.
+        """
+        dx, dy = bx - ax, by - ay
+        count = 0
+        for x0, y0, x1, y1 in self.edges_near_segment(ax, ay, bx, by):
+            s0 = dx * (y0 - ay) - dy * (x0 - ax)
+            s1 = dx * (y1 - ay) - dy * (x1 - ax)
+            if (s0 > 0) == (s1 > 0):
+                continue
+            ex, ey = x1 - x0, y1 - y0
+            denom = dx * ey - dy * ex
+            if denom == 0:
+                continue
+            t = ((x0 - ax) * ey - (y0 - ay) * ex) / denom
+            if 0 < t < 1:
+                count += 1
+        return count
+
+    def hits(self, ax: float, ay: float, bx: float, by: float) -> list[float]:
+        """Sorted parameters of the points where the segment meets the boundary.
+
+        Where the segment runs along an edge, both ends of the overlap count.
+        """
+        dx, dy = bx - ax, by - ay
+        length2 = dx * dx + dy * dy
+        found = []
+        for x0, y0, x1, y1 in self.edges_near_segment(ax, ay, bx, by):
+            ex, ey = x1 - x0, y1 - y0
+            denom = dx * ey - dy * ex
+            side = (x0 - ax) * dy - (y0 - ay) * dx
+            if denom == 0:
+                if side != 0 or length2 == 0:
+                    continue
+                # collinear, keep the ends of the overlap
+                t0 = ((x0 - ax) * dx + (y0 - ay) * dy) / length2
+                t1 = ((x1 - ax) * dx + (y1 - ay) * dy) / length2
+                lo, hi = max(min(t0, t1), 0.0), min(max(t0, t1), 1.0)
+                if lo <= hi:
+                    found += [lo, hi]
+                continue
+            t = ((x0 - ax) * ey - (y0 - ay) * ex) / denom
+            u = side / denom
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                found.append(t)
+
+        found.sort()
+        merged = found[:1]
+        for t in found[1:]:
+            if t - merged[-1] > _MERGE_TOL:
+                merged.append(t)
+        return merged
+
+    def first_hit(self, ax: float, ay: float, bx: float, by: float) -> float | None:
+        """Parameter of the first boundary point from a towards b, if any."""
+        hits = self.hits(ax, ay, bx, by)
+        return hits[0] if hits else None
+
+    def last_hit(self, ax: float, ay: float, bx: float, by: float) -> float | None:
+        """Parameter of the last boundary point from a towards b, if any."""
+        hits = self.hits(ax, ay, bx, by)
+        return hits[-1] if hits else None
+
+    def crosses_properly(self, ax: float, ay: float, bx: float, by: float) -> bool:
+        """Whether the segment clearly crosses an edge, away from its vertices.
+
+        Such a crossing passes from outside the piece to its inside, so the
+        segment both enters the piece's interior and leaves the piece. The
+        check is conservative: False only means no clear crossing was found.
+        Larger pieces are not looked at before they have been asked
+        `_QUERIES_BEFORE_BUILD` times, until then the answer is False.
+        """
+        if self.__edges is None:
+            self.__queries += 1
+            few = shapely.get_num_coordinates(self.piece) <= _SCAN_EDGES
+            if not few and self.__queries <= _QUERIES_BEFORE_BUILD:
+                return False
+
+        dx, dy = bx - ax, by - ay
+        length = sqrt(dx * dx + dy * dy)
+        for x0, y0, x1, y1 in self.edges_near_segment(ax, ay, bx, by):
+            ex, ey = x1 - x0, y1 - y0
+            # every end clear of the other's line by a fraction of the
+            # segment's length, so tiny edges cannot cross it by rounding
+            clear = _PROPER_TOL * length
+            # the edge's ends on either side of the segment's line, and the
+            # segment's ends on either side of the edge's line
+            s0 = dx * (y0 - ay) - dy * (x0 - ax)
+            s1 = dx * (y1 - ay) - dy * (x1 - ax)
+            r0 = ex * (ay - y0) - ey * (ax - x0)
+            r1 = ex * (by - y0) - ey * (bx - x0)
+            if (
+                min(abs(s0), abs(s1)) > clear * length
+                and min(abs(r0), abs(r1)) > clear * sqrt(ex * ex + ey * ey)
+                and (s0 > 0) != (s1 > 0)
+                and (r0 > 0) != (r1 > 0)
+            ):
+                return True
+        return False
@@ -0,0 +1,267 @@
+"""The tkinter window of a game, imported only when the GUI is shown."""
+
+import tkinter as tk
+
+import src.constants as c
+from players.player import PlayerException
+from src.game import Game
+from src.simulation import GameResult
+
+
+class GameWindow:
+    def __init__(self, game: Game):
+        self.game = game
+        self.args = game.args
+        self.cake = game.cake
+
+        self.pieces = None
+
+        self.root = tk.Tk()
+        self.root.title("Birthday cake")
+
+        self.left_frame = tk.Frame(self.root, bg=c.CANVAS_BG)
+        self.left_frame.pack(side="left", fill="both", expand=True)
+
+        self.canvas = tk.Canvas(
+            self.left_frame,
+            height=c.CANVAS_HEIGHT,
+            width=c.CANVAS_WIDTH * c.CAKE_PORTION,
+            bg=c.CANVAS_BG,
+            highlightthickness=0,
+        )
+        self.canvas.pack(fill="both", expand=True)
+
+        if not self.args.sandbox:
+            self.right_frame = tk.Frame(
+                self.root, bg="#f3f3f3", width=c.CANVAS_WIDTH * c.INFO_PORTION
+            )
+            self.right_frame.pack(side="right", fill="y")
+            self.right_frame.pack_propagate(False)
+            self.info = tk.Canvas(
+                self.right_frame,
+                height=c.CANVAS_HEIGHT,
+                width=c.CANVAS_WIDTH * c.INFO_PORTION,
+                bg=c.CANVAS_BG,
+            )
+            self.info.pack(fill="both", expand=True, padx=8, pady=8)
+
+            self.create_buttons()
+        self.draw_cake()
+
+    def handle_play(self):
+        self.root.after(50, self.play)
+
+    def play(self):
+        try:
+            result = self.game.play()
+        except PlayerException as e:
+            self.print_overlay_message(f"{str(e)[:100]}")
+            raise e
+        except Exception as e:
+            self.print_overlay_message(f"Exception: {str(e)[:100]}")
+            raise e
+
+        self.draw_result(result)
+
+    def score_to_color_pow(self, v: float, gamma: float = 2.2) -> str:
+        v = max(0.0, min(1.0, v))
+        t = v**gamma  # nonlinear progress
+        r = int(255 * (1 - t))  # fade red slowly
+        g = int(255 * t)  # grow green slowly
+        b = 0
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def print_overlay_message(self, msg: str):
+        size_x, size_y = 500, 300
+        pos_x = c.CANVAS_WIDTH / 2 - size_x / 2
+        pos_y = c.CANVAS_HEIGHT / 2 - size_y / 2
+        self.canvas.create_rectangle(
+            pos_x, pos_y, pos_x + size_x, pos_y + size_y, fill="white", stipple="gray50"
+        )
+        self.canvas.create_text(
+            pos_x + size_x / 2,
+            pos_y + size_y / 2,
+            text=msg,
+            font=("Arial", c.FONT_SIZE, "bold"),
+            fill="red",
+            width=size_x * 0.8,
+        )
+
+    def create_colored_text(self, canvas, x, y, segments):
+        ids = []
+        cur_x = x
+        for seg in segments:
+            item_id = canvas.create_text(
+                cur_x,
+                y,
+                text=seg["text"],
+                fill=seg.get("fill", "black"),
+                font=seg.get("font", ("Arial", 12)),
+                anchor="w",
+            )
+            ids.append(item_id)
+            # advance x by this segment's width
+            x0, y0, x1, y1 = canvas.bbox(item_id)
+            cur_x = x1
+        return ids
+
+    def draw_cut_areas(self, result: GameResult):
+        target_ratio = self.cake.interior_shape.area / self.cake.exterior_shape.area
+
+        if self.pieces:
+            for p in self.pieces:
+                self.info.delete(p)
+
+        size_score = result.pieces_are_even
+
+        pieces = []
+        for i, (area, piece_ratio) in enumerate(zip(result.areas, result.ratios)):
+            x = 20
+            y = 240 + i * 32
+
+            ratio_score = 1 - abs(piece_ratio - target_ratio) / target_ratio
+
+            ids = self.create_colored_text(
+                self.info,
+                x,
+                y,
+                [
+                    {
+                        "text": f"{i}: size=",
+                        "fill": "black",
+                        "font": ("Arial", c.FONT_SIZE),
+                    },
+                    {
+                        "text": f"{area:.2f}cm^2",
+                        "fill": self.score_to_color_pow(size_score, gamma=c.AREA_GAMMA),
+                        "font": ("Arial", c.FONT_SIZE, "bold"),
+                    },
+                    {
+                        "text": ", ratio=",
+                        "fill": "black",
+                        "font": ("Arial", c.FONT_SIZE),
+                    },
+                    {
+                        "text": f"{piece_ratio:.2f}",
+                        "fill": self.score_to_color_pow(
+                            ratio_score, gamma=c.RATIO_GAMMA
+                        ),
+                        "font": ("Arial", c.FONT_SIZE, "bold"),
+                    },
+                ],
+            )
+            pieces.extend(ids)
+        self.pieces = pieces
+
+    def create_buttons(self):
+        def on_enter(e):
+            e.widget["foreground"] = "gray"
+
+        def on_leave(e):
+            e.widget["foreground"] = "black"
+
+        btn = tk.Button(
+            self.info,
+            text="Play",
+            font=("Arial", c.FONT_SIZE),
+            command=self.handle_play,
+        )
+        btn.bind("<Enter>", on_enter)
+        btn.bind("<Leave>", on_leave)
+
+        btn.pack(pady=10)
+
+        self.children_text = self.info.create_text(
+            20,
+            100,
+            text=f"children: {self.args.children}",
+            font=("Arial", c.FONT_SIZE),
+            fill="black",
+            activefill="gray",
+            tags="children_text",
+            anchor="w",
+        )
+
+        target_area = self.cake.exterior_shape.area / self.args.children
+        target_ratio = self.cake.interior_shape.area / self.cake.exterior_shape.area
+
+        self.info.create_text(
+            20,
+            170,
+            text=f"TARGET\nsize={target_area:.2f}cm^2, ratio={target_ratio:.2f}",
+            font=("Arial", c.FONT_SIZE),
+            fill="black",
+            anchor="w",
+        )
+
+    def draw_cake(self):
+        self.cake.draw(self.canvas, draw_angles=self.args.debug)
+
+    def draw_result(self, result: GameResult):
+        x_offset, y_offset = self.cake.get_offsets()
+        for from_p, to_p in result.cuts:
+            x0, y0, x1, y1 = from_p.x, from_p.y, to_p.x, to_p.y
+            self.canvas.create_line(
+                x0 * c.CAKE_SCALE + x_offset,
+                y0 * c.CAKE_SCALE + y_offset,
+                x1 * c.CAKE_SCALE + x_offset,
+                y1 * c.CAKE_SCALE + y_offset,
+                width=2,
+                fill="black",
+            )
+
+            if self.args.debug:
+                self.canvas.create_text(
+                    x0 * c.CAKE_SCALE + x_offset,
+                    y0 * c.CAKE_SCALE - 10 + y_offset,
+                    text=f"({x0:.1f}, {y0:.1f})",
+                    font=("Arial", c.SMALL_FONT_SIZE),
+                    fill="black",
+                )
+                self.canvas.create_text(
+                    x1 * c.CAKE_SCALE + x_offset,
+                    y1 * c.CAKE_SCALE - 10 + y_offset,
+                    text=f"({x1:.1f}, {y1:.1f})",
+                    font=("Arial", c.SMALL_FONT_SIZE),
+                    fill="black",
+                )
+
+        self.draw_cut_areas(result)
+
+        self.info.create_text(
+            20,
+            c.CANVAS_HEIGHT - 130,
+            text="Score:",
+            font=("Arial", c.FONT_SIZE),
+            fill="black",
+            anchor="w",
+        )
+
+        self.create_colored_text(
+            self.info,
+            20,
+            c.CANVAS_HEIGHT - 90,
+            [
+                {
+                    "text": "size span = ",
+                    "fill": "black",
+                    "font": ("Arial", c.FONT_SIZE),
+                },
+                {
+                    "text": f"{result.size_span:.2f}cm^2",
+                    "fill": self.score_to_color_pow(result.pieces_are_even),
+                    "font": ("Arial", c.FONT_SIZE, "bold"),
+                },
+            ],
+        )
+        self.info.create_text(
+            20,
+            c.CANVAS_HEIGHT - 50,
+            text=f"stdev(ratios) = {result.ratio_stdev:.2f}",
+            font=("Arial", c.FONT_SIZE),
+            fill="black",
+            anchor="w",
+        )
+
+    def run(self):
+        self.root.mainloop()
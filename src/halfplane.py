@@ -0,0 +1,125 @@
+"""Areas of polygons clipped against many half-planes at once.
+
+A half-plane is given by an angle and an offset: it contains the points `p`
+with `p . (cos(angle), sin(angle)) <= offset`. Every cut line splits a piece
+into the part below and the part above such an offset, so probing "how much
+area lies on this side of the line" for a whole grid of lines becomes a
+single NumPy computation instead of one `split` per line.
+"""
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, Polygon
+from shapely.geometry.base import BaseGeometry
+
+# upper bound on the elements of the temporary (angles, offsets, edges) arrays
+_CHUNK = 1 << 21
+
+
+def polygon_rings(geom: BaseGeometry) -> list[np.ndarray]:
+    """Closed coordinate arrays of all polygon rings in `geom`.
+
+    Shells are oriented counter-clockwise and holes clockwise, so the signed
+    shoelace area of all rings adds up to the area of `geom`. Non-polygonal
+    parts (e.g. lines left over from an intersection) are ignored.
+    """
+    rings = []
+    for part in shapely.get_parts(geom):
+        if not isinstance(part, (Polygon, MultiPolygon)) or part.is_empty:
+            continue
+        for polygon in shapely.get_parts(shapely.orient_polygons(part)):
+            rings.append(np.asarray(polygon.exterior.coords))
+            rings.extend(np.asarray(hole.coords) for hole in polygon.interiors)
+    return rings
+
+
+def halfplane_areas(
+    geom: BaseGeometry | list[np.ndarray], angles, offsets
+) -> np.ndarray:
+    """Area of `geom` inside every half-plane of the (angles x offsets) grid.
+
+    `geom` is a (Multi)Polygon or the output of `polygon_rings`. Returns an
+    array of shape (len(angles), len(offsets)).
+    """
+    rings = geom if isinstance(geom, list) else polygon_rings(geom)
+    angles = np.atleast_1d(np.asarray(angles, dtype=float))
+    offsets = np.atleast_1d(np.asarray(offsets, dtype=float))
+
+    areas = np.zeros((len(angles), len(offsets)))
+    for ring in rings:
+        areas += _ring_halfplane_areas(ring, angles, offsets)
+    return areas
+
+
+def halfplane_areas_paired(
+    geom: BaseGeometry | list[np.ndarray], angles, offsets
+) -> np.ndarray:
+    """Area of `geom` inside the half-planes given by pairs of angles and offsets.
+
+    Unlike `halfplane_areas`, `angles` and `offsets` are matched up
+    elementwise (after broadcasting), e.g. one half-plane per candidate cut.
+    """
+    rings = geom if isinstance(geom, list) else polygon_rings(geom)
+    angles, offsets = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(angles, dtype=float)),
+        np.atleast_1d(np.asarray(offsets, dtype=float)),
+    )
+    angles, offsets = angles.ravel(), offsets.ravel()
+
+    areas = np.zeros(len(angles))
+    for ring in rings:
+        step = max(1, _CHUNK // len(ring))
+        for lo in range(0, len(angles), step):
+            cos = np.cos(angles[lo : lo + step])[:, None]
+            sin = np.sin(angles[lo : lo + step])[:, None]
+            xs = cos * ring[:, 0] + sin * ring[:, 1] - offsets[lo : lo + step, None]
+            ys = cos * ring[:, 1] - sin * ring[:, 0]
+            areas[lo : lo + step] += _clipped_areas(xs, ys)
+    return areas
+
+
+def _ring_halfplane_areas(
+    ring: np.ndarray, angles: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    # rotate so that every half-plane becomes {x <= offset}
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    x = cos * ring[:, 0] + sin * ring[:, 1]
+    y = cos * ring[:, 1] - sin * ring[:, 0]
+
+    areas = np.empty((len(angles), len(offsets)))
+    step = max(1, _CHUNK // (len(offsets) * len(ring)))
+    for lo in range(0, len(angles), step):
+        xs = x[lo : lo + step, None, :] - offsets[None, :, None]
+        ys = np.broadcast_to(y[lo : lo + step, None, :], xs.shape)
+        areas[lo : lo + step] = _clipped_areas(xs, ys)
+
+    return areas
+
+
+def _clipped_areas(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Area of rings (along the last axis) clipped to {x <= 0}."""
+    # measured from a point on the cut line, the parts of the clipped ring
+    # running along the line add nothing to the shoelace sum, so only the
+    # clipped edges remain
+    x0, x1 = xs[..., :-1], xs[..., 1:]
+    y0, y1 = ys[..., :-1], ys[..., 1:]
+
+    in0, in1 = x0 <= 0, x1 <= 0
+    # edges outside the half-plane may produce nan here, they're masked out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_cross = y0 - x0 * (y1 - y0) / (x1 - x0)
+        ux, uy = np.where(in0, x0, 0.0), np.where(in0, y0, y_cross)
+        vx, vy = np.where(in1, x1, 0.0), np.where(in1, y1, y_cross)
+        cross = np.where(in0 | in1, ux * vy - vx * uy, 0.0)
+    return 0.5 * cross.sum(axis=-1)
+
+
+def projection_bounds(geom: BaseGeometry | list[np.ndarray], angles) -> np.ndarray:
+    """(len(angles), 2) array of the min and max offset `geom` spans per angle."""
+    rings = geom if isinstance(geom, list) else polygon_rings(geom)
+    points = np.concatenate(rings)
+    angles = np.atleast_1d(np.asarray(angles, dtype=float))
+    proj = (
+        np.cos(angles)[:, None] * points[:, 0] + np.sin(angles)[:, None] * points[:, 1]
+    )
+    return np.stack([proj.min(axis=1), proj.max(axis=1)], axis=1)
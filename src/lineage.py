@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from shapely import Polygon
+
+if TYPE_CHECKING:
+    from src.cake import ValidatedCut
+
+
+@dataclass(frozen=True, slots=True)
+class CutRecord:
+    """A performed cut, and where its piece was in the piece list."""
+
+    cut: "ValidatedCut"
+    index: int
+
+
+class CutTree:
+    """How the pieces of a cake came about, as a forest of binary cuts.
+
+    Every cut splits one piece into two, so cuts form a tree over the
+    pieces: the cut that produced a cut's piece is its parent, the cuts of
+    its two halves are its children. Cuts are numbered in the order they
+    were made. The pieces the cake started with are the roots.
+    """
+
+    def __init__(self, roots: list[Polygon]):
+        self.roots = list(roots)
+        self.cuts: list[CutRecord] = []
+        # id(piece) -> the cut that split the piece, and the one producing it
+        self.__split_by: dict[int, int] = {}
+        self.__made_by: dict[int, int] = {}
+
+    def copy(self) -> "CutTree":
+        new = CutTree(self.roots)
+        new.cuts = list(self.cuts)
+        new.__split_by = dict(self.__split_by)
+        new.__made_by = dict(self.__made_by)
+        return new
+
+    def __len__(self) -> int:
+        return len(self.cuts)
+
+    def add(self, record: CutRecord):
+        k = len(self.cuts)
+        self.cuts.append(record)
+        self.__split_by[id(record.cut.piece)] = k
+        for piece in record.cut.pieces:
+            self.__made_by[id(piece)] = k
+
+    def pop(self) -> CutRecord:
+        """Forget the last cut, e.g. when it is undone."""
+        record = self.cuts.pop()
+        del self.__split_by[id(record.cut.piece)]
+        for piece in record.cut.pieces:
+            del self.__made_by[id(piece)]
+        return record
+
+    def parent(self, k: int) -> int | None:
+        """The cut that produced the piece cut `k` split, None for a root piece."""
+        return self.__made_by.get(id(self.cuts[k].cut.piece))
+
+    def children(self, k: int) -> list[int]:
+        """The cuts made on the two halves of cut `k`."""
+        halves = self.cuts[k].cut.pieces
+        return [self.__split_by[id(p)] for p in halves if id(p) in self.__split_by]
+
+    def subtree(self, k: int) -> list[int]:
+        """Cut `k` and all cuts made on pieces cut from it, in cut order."""
+        found, todo = [], [k]
+        while todo:
+            cut = todo.pop()
+            found.append(cut)
+            todo += self.children(cut)
+        return sorted(found)
+
+    def leaves(self, k: int) -> list[Polygon]:
+        """The uncut pieces descending from cut `k`."""
+        return [
+            piece
+            for cut in self.subtree(k)
+            for piece in self.cuts[cut].cut.pieces
+            if id(piece) not in self.__split_by
+        ]
+
+    def dependency_order(self) -> list[int]:
+        """All cuts ordered so each comes after the cut producing its piece.
+
+        Breadth-first from the root pieces, so cuts of independent pieces
+        are interleaved level by level.
+        """
+        level = [k for k in range(len(self.cuts)) if self.parent(k) is None]
+        order = []
+        while level:
+            order += level
+            level = [child for k in level for child in self.children(k)]
+        return order
@@ -0,0 +1,165 @@
+"""Where the time and memory of a game go.
+
+A `Meter` times the phases of a game, wall clock and CPU, and while active
+counts calls of the expensive shapely operations made anywhere in the
+process, by the players and the simulator alike. Asked to, it also traces
+the game's peak memory with `tracemalloc`.
+"""
+
+import sys
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter, process_time
+
+import shapely
+import shapely.lib
+import shapely.ops
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+@dataclass(frozen=True)
+class Timing:
+    """Seconds spent in a phase. CPU time covers all threads of the process."""
+
+    wall: float
+    cpu: float
+
+
+@dataclass(frozen=True)
+class RunMetrics:
+    """Resources a game used, phase by phase.
+
+    `init` is the player's `__init__`, `get_cuts` its planning, `replay`
+    validating and performing its cuts. `peak_rss` is the process' peak
+    resident set size in bytes over its whole lifetime, None where it cannot
+    be measured: it is the game's own only in a process that plays a single
+    game, like a tournament worker. `peak_traced` is the most memory the
+    game allocated through Python at once, in bytes, None unless traced
+    (see `Meter`). `shapely_calls` counts calls per operation; a vectorized
+    call counts once, and work in other processes (e.g. joblib workers) is
+    not seen.
+    """
+
+    init: Timing
+    get_cuts: Timing
+    replay: Timing
+    peak_rss: int | None
+    peak_traced: int | None = None
+    shapely_calls: dict[str, int] = field(default_factory=dict)
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# (owner, attribute, operation) of the functions counted. Geometry methods
+# end up in these, e.g. `Polygon.buffer` in `shapely.buffer`, and
+# `Polygon.intersection` in `shapely.intersection` or, from shapely 2.2 on,
+# in `shapely.lib.intersection_scalar`. Functions missing from the installed
+# shapely are skipped.
+_COUNTED = [
+    (shapely, "intersection", "intersection"),
+    (shapely.lib, "intersection_scalar", "intersection"),
+    (shapely.lib, "intersection_prec_scalar", "intersection"),
+    (shapely, "buffer", "buffer"),
+    (shapely.ops.SplitOp, "_split_polygon_with_line", "split"),
+    (shapely.ops.SplitOp, "_split_line_with_line", "split"),
+    (shapely.ops.SplitOp, "_split_line_with_point", "split"),
+    (shapely.ops.SplitOp, "_split_line_with_multipoint", "split"),
+]
+
+
+class Meter:
+    """Meters one game.
+
+    With `trace_memory`, `tracing` measures the game's peak memory with
+    `tracemalloc`. That is off by default: tracing makes a game about three
+    times slower, which skews its timings and players with a time budget,
+    and it does not see what GEOS allocates itself.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.timings: dict[str, Timing] = {}
+        self.shapely_calls: Counter[str] = Counter()
+        self.peak_traced: int | None = None
+
+    @contextmanager
+    def timed(self, phase: str):
+        """Time the body as `phase`."""
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield
+        finally:
+            self.timings[phase] = Timing(perf_counter() - wall, process_time() - cpu)
+
+    @contextmanager
+    def counting(self):
+        """Count shapely operations while in the body."""
+        counted_here = [
+            (owner, name, operation, function)
+            for owner, name, operation in _COUNTED
+            if (function := getattr(owner, name, None)) is not None
+        ]
+        counts = self.shapely_calls
+
+        def counted(function, operation: str):
+            def wrapper(*args, **kwargs):
+                counts[operation] += 1
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        for owner, name, operation, function in counted_here:
+            wrapper = counted(function, operation)
+            if isinstance(owner, type):
+                wrapper = staticmethod(wrapper)
+            setattr(owner, name, wrapper)
+        try:
+            yield
+        finally:
+            for owner, name, _, function in counted_here:
+                if isinstance(owner, type):
+                    function = staticmethod(function)
+                setattr(owner, name, function)
+
+    @contextmanager
+    def tracing(self):
+        """Trace the peak memory allocated in the body, if asked to."""
+        if not self.trace_memory:
+            yield
+            return
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self.peak_traced = tracemalloc.get_traced_memory()[1] - before
+            if started:
+                tracemalloc.stop()
+
+    def metrics(self) -> RunMetrics:
+        none = Timing(0.0, 0.0)
+        return RunMetrics(
+            init=self.timings.get("init", none),
+            get_cuts=self.timings.get("get_cuts", none),
+            replay=self.timings.get("replay", none),
+            peak_rss=peak_rss(),
+            peak_traced=self.peak_traced,
+            shapely_calls=dict(self.shapely_calls),
+        )
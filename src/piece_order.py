@@ -0,0 +1,211 @@
+from shapely import Polygon
+
+from src.stats import PieceRecord
+
+
+class IndexedHeap:
+    """Max-heap of integer keys that supports removing and updating any key.
+
+    The position of every key in the heap is tracked, so besides `push` and
+    `pop`, `remove` and `update` are O(log n) as well. Equal priorities are
+    ordered by insertion, earlier keys first.
+    """
+
+    def __init__(self):
+        # (priority, -insertion, key), so larger tuples come first
+        self.entries: list[tuple[float, int, int]] = []
+        self.positions: dict[int, int] = {}
+        self.inserted = 0
+
+    def copy(self) -> "IndexedHeap":
+        new = IndexedHeap()
+        new.entries = list(self.entries)
+        new.positions = dict(self.positions)
+        new.inserted = self.inserted
+        return new
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.positions
+
+    def push(self, key: int, priority: float):
+        self.inserted += 1
+        self.entries.append((priority, -self.inserted, key))
+        self.positions[key] = len(self.entries) - 1
+        self.__sift_up(len(self.entries) - 1)
+
+    def peek(self) -> int | None:
+        return self.entries[0][2] if self.entries else None
+
+    def pop(self) -> int | None:
+        key = self.peek()
+        if key is not None:
+            self.remove(key)
+        return key
+
+    def remove(self, key: int):
+        i = self.positions.pop(key)
+        last = self.entries.pop()
+        if i < len(self.entries):
+            self.entries[i] = last
+            self.positions[last[2]] = i
+            self.__sift_up(i)
+            self.__sift_down(self.positions[last[2]])
+
+    def update(self, key: int, priority: float):
+        i = self.positions[key]
+        _, order, _ = self.entries[i]
+        self.entries[i] = (priority, order, key)
+        self.__sift_up(i)
+        self.__sift_down(self.positions[key])
+
+    def __swap(self, i: int, j: int):
+        entries = self.entries
+        entries[i], entries[j] = entries[j], entries[i]
+        self.positions[entries[i][2]] = i
+        self.positions[entries[j][2]] = j
+
+    def __sift_up(self, i: int):
+        entries = self.entries
+        while i > 0:
+            parent = (i - 1) // 2
+            if entries[parent] >= entries[i]:
+                break
+            self.__swap(i, parent)
+            i = parent
+
+    def __sift_down(self, i: int):
+        entries = self.entries
+        n = len(entries)
+        while True:
+            best = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and entries[child] > entries[best]:
+                    best = child
+            if best == i:
+                return
+            self.__swap(i, best)
+            i = best
+
+
+class PieceOrder:
+    """The pieces of a cake, ordered for planners picking the next piece to cut.
+
+    Keeps indexed heaps of the pieces by area, by distance of the area from
+    `target_area` and by distance of the crust ratio from `target_ratio`, so
+    the top piece of each is available in O(1) and a cut updates them in
+    O(log n). Pieces can also carry numeric tags, e.g. the number of
+    children a piece is meant for, and be ordered by any of them.
+    """
+
+    def __init__(self, target_area: float, target_ratio: float):
+        self.target_area = target_area
+        self.target_ratio = target_ratio
+        self.__records: dict[int, PieceRecord] = {}
+        self.__tags: dict[int, dict[str, float]] = {}
+        self.__by_area = IndexedHeap()
+        self.__by_area_error = IndexedHeap()
+        self.__by_ratio_error = IndexedHeap()
+        self.__by_tag: dict[str, IndexedHeap] = {}
+
+    def copy(self) -> "PieceOrder":
+        new = PieceOrder(self.target_area, self.target_ratio)
+        new.__records = dict(self.__records)
+        new.__tags = {key: dict(tags) for key, tags in self.__tags.items()}
+        new.__by_area = self.__by_area.copy()
+        new.__by_area_error = self.__by_area_error.copy()
+        new.__by_ratio_error = self.__by_ratio_error.copy()
+        new.__by_tag = {tag: heap.copy() for tag, heap in self.__by_tag.items()}
+        return new
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+    def add(self, record: PieceRecord, tags: dict[str, float] | None = None):
+        key = id(record.piece)
+        self.__records[key] = record
+        self.__by_area.push(key, record.area)
+        self.__by_area_error.push(key, abs(record.area - self.target_area))
+        self.__by_ratio_error.push(key, abs(record.ratio - self.target_ratio))
+        if tags:
+            self.set_tags(record.piece, **tags)
+
+    def remove(self, piece: Polygon) -> dict[str, float]:
+        """Drop `piece`, returning its tags."""
+        key = id(piece)
+        del self.__records[key]
+        self.__by_area.remove(key)
+        self.__by_area_error.remove(key)
+        self.__by_ratio_error.remove(key)
+
+        tags = self.__tags.pop(key, {})
+        for tag in tags:
+            if tag in self.__by_tag:
+                self.__by_tag[tag].remove(key)
+        return tags
+
+    def retarget(self, target_area: float, target_ratio: float):
+        """Order by distance from new targets, rebuilding the affected heaps."""
+        if target_area != self.target_area:
+            self.target_area = target_area
+            self.__by_area_error = IndexedHeap()
+            for key, record in self.__records.items():
+                self.__by_area_error.push(key, abs(record.area - target_area))
+        if target_ratio != self.target_ratio:
+            self.target_ratio = target_ratio
+            self.__by_ratio_error = IndexedHeap()
+            for key, record in self.__records.items():
+                self.__by_ratio_error.push(key, abs(record.ratio - target_ratio))
+
+    def __piece(self, heap: IndexedHeap) -> Polygon | None:
+        key = heap.peek()
+        return self.__records[key].piece if key is not None else None
+
+    def largest(self) -> Polygon | None:
+        return self.__piece(self.__by_area)
+
+    def furthest_from_area(self) -> Polygon | None:
+        """The piece whose area is furthest from `target_area`."""
+        return self.__piece(self.__by_area_error)
+
+    def furthest_from_ratio(self) -> Polygon | None:
+        """The piece whose crust ratio is furthest from `target_ratio`."""
+        return self.__piece(self.__by_ratio_error)
+
+    def get_tags(self, piece: Polygon) -> dict[str, float]:
+        return dict(self.__tags.get(id(piece), {}))
+
+    def set_tags(self, piece: Polygon, **tags: float | None):
+        """Set (or with None, clear) tags of `piece`, which must be ordered."""
+        key = id(piece)
+        if self.__records[key].piece is not piece:
+            raise KeyError("piece is not part of the order")
+
+        current = self.__tags.setdefault(key, {})
+        for tag, value in tags.items():
+            heap = self.__by_tag.get(tag)
+            if value is None:
+                if current.pop(tag, None) is not None and heap is not None:
+                    heap.remove(key)
+                continue
+            if heap is not None:
+                if tag in current:
+                    heap.update(key, value)
+                else:
+                    heap.push(key, value)
+            current[tag] = value
+        if not current:
+            del self.__tags[key]
+
+    def most(self, tag: str) -> Polygon | None:
+        """The piece with the largest value of `tag`, among pieces having it."""
+        heap = self.__by_tag.get(tag)
+        if heap is None:
+            # the first query for a tag builds its heap, cuts maintain it
+            heap = self.__by_tag[tag] = IndexedHeap()
+            for key, tags in self.__tags.items():
+                if tag in tags:
+                    heap.push(key, tags[tag])
+        return self.__piece(heap)
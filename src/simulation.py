@@ -0,0 +1,87 @@
+import random
+from dataclasses import dataclass
+
+from shapely import Point
+
+from players.player import Player
+from src.cake import Cake
+from src.metering import Meter, RunMetrics
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """What a game produced, and what it took to produce it.
+
+    `areas` and `ratios` are per piece, in the order of `Cake.get_pieces`.
+    `ratio_stdev` is in percent, as it is scored.
+    """
+
+    cuts: list[tuple[Point, Point]]
+    areas: list[float]
+    ratios: list[float]
+    size_span: float
+    pieces_are_even: bool
+    ratio_stdev: float
+    metrics: RunMetrics
+
+    def score_text(self) -> str:
+        return (
+            f"SCORE:\nsize span: {self.size_span:.2f}cm^2\n"
+            f"stdev(ratio): {self.ratio_stdev:.2f}"
+        )
+
+
+def run_game(
+    cake: Cake,
+    player_cls: type[Player],
+    children: int,
+    seed: int | None = None,
+    cake_path: str | None = None,
+    trace_memory: bool = False,
+) -> GameResult:
+    """Let `player_cls` cut `cake` for `children` and score the result.
+
+    The player plans on a copy, its cuts are then validated and performed on
+    `cake` itself. `seed` seeds the random module first; leave it None when
+    the caller seeded it already, e.g. before generating the cake.
+    `trace_memory` measures the game's peak memory, at the cost of a slower
+    game, see `Meter`. Raises when the player fails or its cuts are invalid.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    meter = Meter(trace_memory)
+    with meter.counting(), meter.tracing():
+        with meter.timed("init"):
+            player = player_cls(
+                children=children, cake=cake.copy(), cake_path=cake_path
+            )
+
+        with meter.timed("get_cuts"):
+            cuts = player.get_cuts()
+
+        if len(cuts) != children - 1:
+            raise Exception(
+                f"Player Exception: Invalid amount of cuts. expected {children - 1}, got {len(cuts)}"
+            )
+
+        with meter.timed("replay"):
+            for from_p, to_p in cuts:
+                cake.cut(from_p, to_p)
+
+    pieces = cake.get_pieces()
+    if len(pieces) != children:
+        raise Exception(
+            f"Invalid amount of pieces: expected {children}, got {len(pieces)}"
+        )
+
+    return GameResult(
+        cuts=list(cuts),
+        areas=cake.get_piece_sizes(),
+        ratios=cake.get_piece_ratios(),
+        size_span=cake.get_size_span(),
+        pieces_are_even=cake.pieces_are_even(),
+        # ratios are scored in percent
+        ratio_stdev=cake.get_ratio_stdev() * 100,
+        metrics=meter.metrics(),
+    )
@@ -0,0 +1,123 @@
+from math import floor
+
+import numpy as np
+
+
+class PieceGrid:
+    """Uniform grid over the bounding boxes of cake pieces.
+
+    Every piece is registered in each cell its bounding box overlaps, so a
+    point query only has to look at the pieces sharing the point's cell(s)
+    instead of all pieces of the cake. Pieces are identified by an opaque
+    integer key chosen by the caller.
+    """
+
+    def __init__(self, bounds: tuple[float, float, float, float], cells: int):
+        minx, miny, maxx, maxy = bounds
+        self.origin = (minx, miny)
+        self.cell_size = max(maxx - minx, maxy - miny, 1e-9) / cells
+        self.cells: dict[tuple[int, int], set[int]] = {}
+        self.cells_of: dict[int, list[tuple[int, int]]] = {}
+
+    def copy(self) -> "PieceGrid":
+        new = object.__new__(PieceGrid)
+        new.origin = self.origin
+        new.cell_size = self.cell_size
+        new.cells = {cell: set(keys) for cell, keys in self.cells.items()}
+        new.cells_of = dict(self.cells_of)
+        return new
+
+    def cell_range(self, minx: float, miny: float, maxx: float, maxy: float):
+        ox, oy = self.origin
+        size = self.cell_size
+        return (
+            floor((minx - ox) / size),
+            floor((miny - oy) / size),
+            floor((maxx - ox) / size),
+            floor((maxy - oy) / size),
+        )
+
+    def insert(self, key: int, bounds: tuple[float, float, float, float]):
+        i0, j0, i1, j1 = self.cell_range(*bounds)
+        covered = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+        for cell in covered:
+            self.cells.setdefault(cell, set()).add(key)
+        self.cells_of[key] = covered
+
+    def insert_many(self, keys: list[int], bounds: np.ndarray):
+        """Insert all `keys` at once, `bounds` holding a row of bounds per key."""
+        ox, oy = self.origin
+        ranges = np.floor((bounds - (ox, oy, ox, oy)) / self.cell_size)
+        cells = self.cells
+        for key, (i0, j0, i1, j1) in zip(keys, ranges.astype(int).tolist()):
+            covered = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+            for cell in covered:
+                found = cells.get(cell)
+                if found is None:
+                    cells[cell] = {key}
+                else:
+                    found.add(key)
+            self.cells_of[key] = covered
+
+    def remove(self, key: int):
+        for cell in self.cells_of.pop(key):
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+    def query_point(self, x: float, y: float, tol: float) -> set[int]:
+        """Keys of all pieces whose bounding box may lie within `tol` of (x, y)."""
+        i0, j0, i1, j1 = self.cell_range(x - tol, y - tol, x + tol, y + tol)
+        found: set[int] = set()
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                keys = self.cells.get((i, j))
+                if keys:
+                    found |= keys
+        return found
+
+    def query_bounds(
+        self, bounds: tuple[float, float, float, float], tol: float
+    ) -> set[int]:
+        """Keys of all pieces whose bounding box may lie within `tol` of `bounds`."""
+        minx, miny, maxx, maxy = bounds
+        i0, j0, i1, j1 = self.cell_range(minx - tol, miny - tol, maxx + tol, maxy + tol)
+        found: set[int] = set()
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                keys = self.cells.get((i, j))
+                if keys:
+                    found |= keys
+        return found
+
+    def query_segment(
+        self, ax: float, ay: float, bx: float, by: float, tol: float
+    ) -> set[int]:
+        """Keys registered in any cell within `tol` of the segment from a to b.
+
+        Walks the grid column by column, so only the cells along the segment
+        are visited rather than all cells of its bounding box.
+        """
+        if ax > bx:
+            ax, ay, bx, by = bx, by, ax, ay
+        ox, _ = self.origin
+        size = self.cell_size
+        i0, _, i1, _ = self.cell_range(ax - tol, 0, bx + tol, 0)
+
+        found: set[int] = set()
+        for i in range(i0, i1 + 1):
+            # the part of the segment within (tol of) this column
+            x0 = max(ox + i * size - tol, ax)
+            x1 = min(ox + (i + 1) * size + tol, bx)
+            if bx > ax:
+                y0 = ay + (x0 - ax) / (bx - ax) * (by - ay)
+                y1 = ay + (x1 - ax) / (bx - ax) * (by - ay)
+            else:
+                y0, y1 = ay, by
+            _, j0, _, j1 = self.cell_range(0, min(y0, y1) - tol, 0, max(y0, y1) + tol)
+            for j in range(j0, j1 + 1):
+                keys = self.cells.get((i, j))
+                if keys:
+                    found |= keys
+        return found
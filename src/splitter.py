@@ -0,0 +1,215 @@
+"""Splitting a simple polygon along a line without shapely's overlay.
+
+`shapely.ops.split` unions the polygon's boundary with the line, polygonizes
+the result and keeps the parts inside the polygon. For a polygon without
+holes and a straight line crossing its ring cleanly, the pieces follow from
+the crossings alone: walk the ring, and at every crossing turn onto the
+line until it leaves the polygon again.
+
+The pieces match those of `split` up to rounding, but about half the time
+come in another order, and their rings start at other vertices and run the
+other way round, with crossing points differing in the last bits. Players
+play on the pieces, so seeded games would change: cut validation only uses
+`split_areas` to reject cuts, and the pieces of valid cuts still come from
+`split`. benchmarks/splitter.py compares the two on every cake.
+"""
+
+from math import sqrt
+
+import numpy as np
+import shapely
+from shapely import LineString, Polygon
+
+# distance (relative to the line's length and the piece's size) within which
+# a vertex counts as lying on the line
+_ON_LINE_TOL = 1e-12
+
+# (position along the line, edge index, fraction along the edge, x, y)
+_Crossing = tuple[float, int, float, float, float]
+
+
+def _crossings(closed: np.ndarray, line: LineString) -> list[_Crossing] | None:
+    """Where `line` crosses the `closed` ring, in order along the line.
+
+    None unless the line crosses cleanly: no vertex on the line or its
+    extension, and both ends of the line outside the ring.
+    """
+    ends = shapely.get_coordinates(line)
+    if len(ends) != 2:
+        return None
+    (ax, ay), (bx, by) = ends.tolist()
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return None
+
+    rel = closed - (ax, ay)
+    side = rel @ (-dy, dx)
+    along = rel @ (dx / length2, dy / length2)
+
+    low, high = closed.min(axis=0), closed.max(axis=0)
+    extent = max(high[0] - low[0], high[1] - low[1])
+    if np.abs(side).min() <= _ON_LINE_TOL * sqrt(length2) * extent:
+        return None
+
+    below = side < 0
+    edges = np.flatnonzero(below[:-1] != below[1:])
+    s0, s1 = side[edges], side[edges + 1]
+    u = s0 / (s0 - s1)
+    a0 = along[edges]
+    t = a0 + u * (along[edges + 1] - a0)
+    # an end is inside if the line crosses the ring an odd number of times
+    # beyond it
+    t_list = t.tolist()
+    if sum(v <= 0 for v in t_list) % 2 or sum(v >= 1 for v in t_list) % 2:
+        return None
+
+    p0 = closed[edges]
+    points = (p0 + u[:, None] * (closed[edges + 1] - p0)).tolist()
+    crossings = [
+        (v, e, f, x, y)
+        for v, e, f, (x, y) in zip(t_list, edges.tolist(), u.tolist(), points)
+        if 0 < v < 1
+    ]
+    crossings.sort()
+    return crossings
+
+
+def _ring(piece: Polygon) -> np.ndarray | None:
+    """The closed coordinates of the piece's ring, None if it has holes."""
+    if shapely.get_num_interior_rings(piece):
+        return None
+    return shapely.get_coordinates(piece)
+
+
+def count_split_pieces(piece: Polygon, line: LineString) -> int | None:
+    """How many pieces `split_simple` cuts `piece` into along `line`.
+
+    A line crossing the ring 2k times leaves k + 1 pieces. None where
+    `split_simple` does not apply.
+    """
+    closed = _ring(piece)
+    if closed is None:
+        return None
+    crossings = _crossings(closed, line)
+    if crossings is None:
+        return None
+    return len(crossings) // 2 + 1
+
+
+def _walk(crossings: list[_Crossing]):
+    """The pieces the crossings cut the ring into, as lists of stretches.
+
+    A stretch `(current, reached)` follows the ring from crossing `current`
+    to crossing `reached`, then the line across to `reached`'s partner,
+    which starts the next stretch.
+    """
+    k = len(crossings)
+    # along the line, the stretches between crossings 0-1, 2-3, ... are inside
+    partner = [i + 1 if i % 2 == 0 else i - 1 for i in range(k)]
+    around = sorted(range(k), key=lambda i: crossings[i][1:3])
+    next_around = {i: around[(j + 1) % k] for j, i in enumerate(around)}
+
+    left = set(range(k))
+    while left:
+        start = current = min(left)
+        stretches = []
+        while True:
+            left.discard(current)
+            reached = next_around[current]
+            stretches.append((current, reached))
+            current = partner[reached]
+            if current == start:
+                break
+        yield stretches
+
+
+def _wraps(crossings: list[_Crossing], current: int, reached: int) -> bool:
+    """Whether the ring passes its first vertex from `current` to `reached`."""
+    _, edge, u, _, _ = crossings[current]
+    _, to_edge, to_u, _, _ = crossings[reached]
+    return not (to_edge > edge or (to_edge == edge and to_u > u))
+
+
+def split_simple(piece: Polygon, line: LineString) -> list[Polygon] | None:
+    """Cut `piece` along the two-point `line`, like `shapely.ops.split`.
+
+    Returns the pieces, just `piece` if the line misses it, or None where
+    this does not apply: pieces with holes, lines through a vertex or along
+    an edge, and lines ending inside the piece. Use `split` for those.
+    """
+    closed = _ring(piece)
+    if closed is None:
+        return None
+    crossings = _crossings(closed, line)
+    if crossings is None:
+        return None
+    if not crossings:
+        return [piece]
+
+    n = len(closed) - 1
+    parts: list[np.ndarray] = []
+    sizes: list[int] = []
+    for stretches in _walk(crossings):
+        size = 0
+        for current, reached in stretches:
+            _, edge, _, x, y = crossings[current]
+            _, to_edge, _, to_x, to_y = crossings[reached]
+            if _wraps(crossings, current, reached):
+                stretch = np.concatenate([closed[edge + 1 : n], closed[: to_edge + 1]])
+            else:
+                stretch = closed[edge + 1 : to_edge + 1]
+            parts += [np.array([[x, y]]), stretch, np.array([[to_x, to_y]])]
+            size += len(stretch) + 2
+        sizes.append(size)
+
+    # rings are closed by shapely
+    indices = np.repeat(np.arange(len(sizes)), sizes)
+    rings = shapely.linearrings(np.concatenate(parts), indices=indices)
+    return list(shapely.polygons(rings))
+
+
+def split_areas(piece: Polygon, line: LineString) -> list[float] | None:
+    """The areas of the pieces of `split_simple`, in the same order.
+
+    Builds no geometries: the shoelace sums of the ring's stretches come
+    from prefix sums over its edges, so each piece costs O(crossings).
+    """
+    closed = _ring(piece)
+    if closed is None:
+        return None
+    crossings = _crossings(closed, line)
+    if crossings is None:
+        return None
+    if not crossings:
+        return [piece.area]
+
+    n = len(closed) - 1
+    x, y = closed[:, 0], closed[:, 1]
+    # prefix[m] is the shoelace sum of the ring from vertex 0 to vertex m
+    prefix = np.concatenate([[0.0], np.cumsum(x[:-1] * y[1:] - x[1:] * y[:-1])])
+    prefix = prefix.tolist()
+    xs, ys = x.tolist(), y.tolist()
+
+    areas = []
+    for stretches in _walk(crossings):
+        total = 0.0
+        for i, (current, reached) in enumerate(stretches):
+            _, edge, _, px, py = crossings[current]
+            _, to_edge, _, rx, ry = crossings[reached]
+            if not _wraps(crossings, current, reached) and to_edge == edge:
+                total += px * ry - rx * py
+            else:
+                first, last = edge + 1, to_edge
+                if first <= last:
+                    ring = prefix[last] - prefix[first]
+                else:
+                    ring = prefix[n] - prefix[first] + prefix[last]
+                total += px * ys[first] - xs[first] * py
+                total += ring
+                total += xs[last] * ry - rx * ys[last]
+            # then the line across, to where the next stretch starts
+            _, _, _, qx, qy = crossings[stretches[(i + 1) % len(stretches)][0]]
+            total += rx * qy - qx * ry
+        areas.append(abs(total) / 2)
+    return areas
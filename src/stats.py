@@ -0,0 +1,71 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from math import sqrt
+
+from shapely import Polygon
+
+
+@dataclass(frozen=True, slots=True)
+class PieceRecord:
+    """Measurements of a single piece, computed once when the piece is created."""
+
+    piece: Polygon
+    area: float
+    interior_area: float
+
+    @property
+    def ratio(self) -> float:
+        return self.interior_area / self.area if self.area else 0
+
+
+class PieceStats:
+    """Running aggregates over the records of all pieces of a cake.
+
+    Areas are kept sorted so the size span is available in O(1), the crust
+    ratios are summarized with Welford's mean/variance, which can also be
+    reversed when a piece is removed.
+    """
+
+    def __init__(self):
+        self.areas: list[float] = []
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def copy(self) -> "PieceStats":
+        new = PieceStats()
+        new.areas = list(self.areas)
+        new.count, new.mean, new.m2 = self.count, self.mean, self.m2
+        return new
+
+    def add(self, record: PieceRecord):
+        insort(self.areas, record.area)
+
+        x = record.ratio
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, record: PieceRecord):
+        self.areas.pop(bisect_left(self.areas, record.area))
+
+        x = record.ratio
+        if self.count == 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - x) / self.count
+        self.m2 = max(0.0, self.m2 - (x - old_mean) * (x - self.mean))
+
+    def size_span(self) -> float:
+        return self.areas[-1] - self.areas[0] if self.areas else 0
+
+    def ratio_mean(self) -> float:
+        return self.mean
+
+    def ratio_stdev(self) -> float:
+        """Sample standard deviation of the crust ratios."""
+        return sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from math import cos, pi, sin
+
+import numpy as np
+from shapely import LineString, Point, Polygon
+from shapely.geometry.base import BaseGeometry
+
+from src.halfplane import polygon_rings
+
+# edges whose projections differ by less than this (relative to the shape's
+# size) are treated as parallel to the cut line, their huge slopes would
+# otherwise swamp the running sums
+_PARALLEL_TOL = 1e-12
+
+
+class AreaSweep:
+    """Exact area of a shape below a sliding cut line of fixed direction.
+
+    For the direction `angle`, a line's offset is `p . (cos, sin)` for any
+    point `p` on it, matching `src.halfplane`. The width of the shape along
+    the line changes linearly between the offsets of its vertices, so the
+    area below the line is a piecewise quadratic in the offset. It is built
+    once in O(n log n) and then evaluated or inverted in O(log n).
+    """
+
+    def __init__(self, geom: BaseGeometry | list[np.ndarray], angle: float):
+        rings = geom if isinstance(geom, list) else polygon_rings(geom)
+        self.angle = angle
+        nx, ny = cos(angle), sin(angle)
+
+        # work relative to the shape's first vertex to keep the numbers small
+        origin = rings[0][0] if rings else np.zeros(2)
+        self.shift = float(origin[0] * nx + origin[1] * ny)
+
+        starts, ends, start_widths, end_widths = [], [], [], []
+        for ring in rings:
+            xy = ring - origin
+            t = xy[:, 0] * nx + xy[:, 1] * ny
+            u = xy[:, 1] * nx - xy[:, 0] * ny
+            t0, t1, u0, u1 = t[:-1], t[1:], u[:-1], u[1:]
+
+            scale = max(np.abs(xy).max(), 1.0)
+            moving = np.abs(t1 - t0) > _PARALLEL_TOL * scale
+            t0, t1, u0, u1 = t0[moving], t1[moving], u0[moving], u1[moving]
+
+            # with shells counter-clockwise, edges moving forward bound the
+            # shape from below and edges moving backward bound it from above
+            forward = t1 > t0
+            sign = np.where(forward, -1.0, 1.0)
+            starts.append(np.where(forward, t0, t1))
+            ends.append(np.where(forward, t1, t0))
+            start_widths.append(sign * np.where(forward, u0, u1))
+            end_widths.append(sign * np.where(forward, u1, u0))
+
+        lo = np.concatenate(starts) if starts else np.zeros(0)
+        hi = np.concatenate(ends) if ends else np.zeros(0)
+        w_lo = np.concatenate(start_widths) if starts else np.zeros(0)
+        w_hi = np.concatenate(end_widths) if ends else np.zeros(0)
+        slope = (w_hi - w_lo) / (hi - lo)
+
+        self.breaks = np.unique(np.concatenate([lo, hi])) if len(lo) else np.zeros(1)
+        first = np.searchsorted(self.breaks, lo)
+        last = np.searchsorted(self.breaks, hi)
+
+        # edges switch on and off at breakpoints, changing the width's slope
+        # and making its value jump
+        d_slope = np.zeros(len(self.breaks))
+        jumps = np.zeros(len(self.breaks))
+        np.add.at(d_slope, first, slope)
+        np.add.at(d_slope, last, -slope)
+        np.add.at(jumps, first, w_lo)
+        np.add.at(jumps, last, -w_hi)
+
+        # on [breaks[k], breaks[k + 1]] the width is widths[k] + slopes[k] * dt
+        gaps = np.diff(self.breaks)
+        self.slopes = np.cumsum(d_slope)
+        growth = np.concatenate([[0.0], np.cumsum(self.slopes[:-1] * gaps)])
+        self.widths = np.maximum(np.cumsum(jumps) + growth, 0.0)
+
+        segments = self.widths[:-1] * gaps + 0.5 * self.slopes[:-1] * gaps**2
+        self.areas = np.concatenate([[0.0], np.cumsum(segments)])
+
+    @property
+    def total(self) -> float:
+        return float(self.areas[-1])
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """The offsets at which the line first and last touches the shape."""
+        return float(self.breaks[0] + self.shift), float(self.breaks[-1] + self.shift)
+
+    def area(self, offset):
+        """Area below `offset`, for a single offset or an array of them."""
+        t = np.clip(np.asarray(offset, dtype=float) - self.shift, *self.breaks[[0, -1]])
+        k = np.clip(np.searchsorted(self.breaks, t, side="right") - 1, 0, None)
+        k = np.minimum(k, max(len(self.breaks) - 2, 0))
+        dt = t - self.breaks[k]
+        area = self.areas[k] + self.widths[k] * dt + 0.5 * self.slopes[k] * dt**2
+        return area if area.ndim else float(area)
+
+    def offset_for_area(self, area):
+        """The offset below which lies exactly `area`, inverting `area()`."""
+        a = np.clip(np.asarray(area, dtype=float), 0.0, self.total)
+        k = np.clip(np.searchsorted(self.areas, a, side="right") - 1, 0, None)
+        k = np.minimum(k, max(len(self.breaks) - 2, 0))
+        rest = a - self.areas[k]
+
+        # solve slopes/2 dt^2 + widths dt = rest, in the cancellation-free form
+        w, s = self.widths[k], self.slopes[k]
+        root = np.sqrt(np.maximum(w * w + 2 * s * rest, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dt = np.where(w + root > 0, 2 * rest / (w + root), 0.0)
+
+        gap = self.breaks[np.minimum(k + 1, len(self.breaks) - 1)] - self.breaks[k]
+        offset = self.breaks[k] + np.clip(dt, 0.0, gap) + self.shift
+        return offset if offset.ndim else float(offset)
+
+
+def cut_endpoints(piece: Polygon, angle: float, offset: float):
+    """First and last point where the line at `offset` meets `piece`'s boundary.
+
+    Returns None if the line misses the piece. For pieces that aren't convex
+    the line may leave and re-enter the piece in between.
+    """
+    nx, ny = cos(angle), sin(angle)
+    minx, miny, maxx, maxy = piece.bounds
+    reach = 2 * (maxx - minx + maxy - miny) + 1
+    cx, cy = (minx + maxx) / 2, (miny + maxy) / 2
+
+    # the point of the line closest to the piece's center
+    d = offset - (cx * nx + cy * ny)
+    mx, my = cx + d * nx, cy + d * ny
+    line = LineString(
+        [(mx + ny * reach, my - nx * reach), (mx - ny * reach, my + nx * reach)]
+    )
+
+    hits = line.intersection(piece.boundary)
+    points = [p for p in getattr(hits, "geoms", [hits]) if isinstance(p, Point)]
+    if len(points) < 2:
+        return None
+
+    points.sort(key=lambda p: -p.x * ny + p.y * nx)
+    return points[0], points[-1]
+
+
+@dataclass(frozen=True)
+class SweepCut:
+    """A straight cut, given by direction and offset, and what lies below it."""
+
+    angle: float
+    offset: float
+    area: float
+    interior_area: float
+
+    @property
+    def ratio(self) -> float:
+        return self.interior_area / self.area if self.area else 0
+
+
+class CrustSweep:
+    """Area and interior (non-crust) area below a sliding cut line.
+
+    `interior` is the piece's share of the cake interior, so the one overlay
+    `piece.intersection(cake.interior_shape)` is all the shapely work needed
+    for any number of directions and offsets.
+    """
+
+    def __init__(
+        self,
+        piece: BaseGeometry | list[np.ndarray],
+        interior: BaseGeometry | list[np.ndarray],
+        angle: float,
+    ):
+        self.angle = float(angle)
+        self.exterior = AreaSweep(piece, angle)
+        self.interior = AreaSweep(interior, angle)
+
+    def cut_for_area(self, area: float) -> SweepCut:
+        offset = self.exterior.offset_for_area(area)
+        return SweepCut(
+            self.angle, offset, self.exterior.area(offset), self.interior.area(offset)
+        )
+
+
+def solve_area_and_ratio(
+    piece: Polygon,
+    interior: BaseGeometry,
+    target_area: float,
+    target_ratio: float,
+    samples: int = 72,
+    iterations: int = 50,
+) -> SweepCut | None:
+    """Find the straight cut leaving `target_area` below it at `target_ratio`.
+
+    For every direction the offset giving the target area follows exactly
+    from the area sweep, leaving a one dimensional root finding problem in
+    the angle: directions are sampled, and sign changes of the ratio error
+    are refined by bisection. Returns the cut with the smallest ratio error,
+    or None if the piece is smaller than `target_area`.
+
+    The returned cut splits the piece into two parts only if the line crosses
+    it once, which always holds for convex pieces. Otherwise validate it
+    with `Cake.validate_cut` before using it.
+    """
+    if not 0 < target_area < piece.area:
+        return None
+
+    outer = polygon_rings(piece)
+    inner = polygon_rings(piece.intersection(interior))
+
+    def solve(angle: float) -> tuple[float, SweepCut]:
+        cut = CrustSweep(outer, inner, angle).cut_for_area(target_area)
+        return cut.ratio - target_ratio, cut
+
+    angles = np.linspace(0, 2 * pi, samples, endpoint=False)
+    errors, cuts = zip(*(solve(angle) for angle in angles))
+    best = min(cuts, key=lambda cut: abs(cut.ratio - target_ratio))
+
+    for i in range(samples):
+        lo, hi = angles[i], angles[i] + 2 * pi / samples
+        err_lo, err_hi = errors[i], errors[(i + 1) % samples]
+        if err_lo * err_hi > 0:
+            continue
+
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            err_mid, cut = solve(mid)
+            if abs(err_mid) < abs(best.ratio - target_ratio):
+                best = cut
+            if err_mid == 0:
+                break
+            if err_lo * err_mid <= 0:
+                hi = mid
+            else:
+                lo, err_lo = mid, err_mid
+
+    return best
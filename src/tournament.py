@@ -0,0 +1,309 @@
+"""Run many games headlessly, in parallel, and collect their scores.
+
+Every run is a separate worker process playing one game with `run_game`,
+so a player that crashes, hangs or exhausts memory only fails its own run.
+Runs are scheduled over as many threads as there are cores, each waiting on
+one process at a time.
+"""
+
+import csv
+import glob
+import json
+import os
+import pathlib
+import random
+import signal
+import subprocess
+import sys
+from argparse import SUPPRESS, ArgumentParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from statistics import mean
+from time import perf_counter
+
+from src.args import Args, sanitize_import_cake, sanitize_player
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# prefixes the worker's result line, players print to stdout as well
+RESULT_MARKER = "RESULT "
+
+
+@dataclass(frozen=True)
+class Run:
+    """One game: a player, a cake file (or None for one generated from the seed)."""
+
+    player: int | str
+    cake: str | None
+    seed: int
+    children: int
+
+
+@dataclass(frozen=True)
+class RunResult:
+    player: int | str
+    cake: str | None
+    seed: int
+    children: int
+    size_span: float | None
+    ratio_stdev: float | None
+    runtime: float
+    failure: str | None
+    # metered in the worker, see `src.metering`; None for failed runs. The
+    # worker plays only this game, so its peak RSS is the game's
+    init_time: float | None = None
+    init_cpu: float | None = None
+    cuts_time: float | None = None
+    cuts_cpu: float | None = None
+    replay_time: float | None = None
+    replay_cpu: float | None = None
+    peak_rss_mb: float | None = None
+    splits: int | None = None
+    intersections: int | None = None
+    buffers: int | None = None
+
+
+def plan_runs(
+    players: list[int | str],
+    cakes: list[str | None],
+    seeds: list[int],
+    children: list[int],
+) -> list[Run]:
+    """All combinations of players, cakes, seeds and children counts."""
+    return [
+        Run(*combination) for combination in product(players, cakes, seeds, children)
+    ]
+
+
+def command(run: Run) -> list[str]:
+    return [sys.executable, "-m", "src.tournament", "--worker", json.dumps(asdict(run))]
+
+
+def work(run: Run):
+    """Play `run` in this process, like `main.py` would, and print the result."""
+    # imported here, so the parent process does not load any players
+    from src.cake import cake_from_args
+    from players.registry import get_player_class
+    from src.simulation import run_game
+
+    args = Args(
+        gui=False,
+        player=run.player,
+        import_cake=sanitize_import_cake(run.cake),
+        seed=run.seed,
+        children=run.children,
+        export_cake=None,
+        debug=False,
+        sandbox=False,
+    )
+    random.seed(args.seed)
+    cake = cake_from_args(args)
+    result = run_game(
+        cake, get_player_class(args.player), args.children, cake_path=args.import_cake
+    )
+    metrics = result.metrics
+    calls = metrics.shapely_calls
+    print(
+        RESULT_MARKER
+        + json.dumps(
+            {
+                "size_span": result.size_span,
+                "ratio_stdev": result.ratio_stdev,
+                "init_time": metrics.init.wall,
+                "init_cpu": metrics.init.cpu,
+                "cuts_time": metrics.get_cuts.wall,
+                "cuts_cpu": metrics.get_cuts.cpu,
+                "replay_time": metrics.replay.wall,
+                "replay_cpu": metrics.replay.cpu,
+                "peak_rss_mb": (
+                    None if metrics.peak_rss is None else metrics.peak_rss / 2**20
+                ),
+                "splits": calls.get("split", 0),
+                "intersections": calls.get("intersection", 0),
+                "buffers": calls.get("buffer", 0),
+            }
+        )
+    )
+
+
+def failure_of(stdout: str, stderr: str, returncode: int) -> str:
+    """The most telling line of a failed run's output."""
+    lines = [line.strip() for line in (stderr or stdout).splitlines() if line.strip()]
+    return lines[-1] if lines else f"exit code {returncode}"
+
+
+def failed(run: Run, runtime: float, failure: str) -> RunResult:
+    return RunResult(
+        **asdict(run),
+        size_span=None,
+        ratio_stdev=None,
+        runtime=runtime,
+        failure=failure,
+    )
+
+
+def play(run: Run, timeout: float) -> RunResult:
+    """Play `run` in its own process, killing it after `timeout` seconds."""
+    start = perf_counter()
+    # a session of its own lets a timeout also kill workers the player spawned
+    with subprocess.Popen(
+        command(run),
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    ) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+            process.communicate()
+            return failed(run, perf_counter() - start, f"timed out after {timeout:g}s")
+    runtime = perf_counter() - start
+
+    lines = [line for line in stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    if process.returncode != 0 or not lines:
+        return failed(run, runtime, failure_of(stdout, stderr, process.returncode))
+    return RunResult(
+        **asdict(run),
+        **json.loads(lines[-1].removeprefix(RESULT_MARKER)),
+        runtime=runtime,
+        failure=None,
+    )
+
+
+def play_all(
+    runs: list[Run], workers: int, timeout: float, progress: bool = True
+) -> list[RunResult]:
+    """Play all `runs`, `workers` at a time, returning results in run order."""
+    results: dict[int, RunResult] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(play, run, timeout): i for i, run in enumerate(runs)}
+        for future in as_completed(futures):
+            result = results[futures[future]] = future.result()
+            if progress:
+                status = result.failure or (
+                    f"size span {result.size_span:.2f}, stdev {result.ratio_stdev:.2f}"
+                )
+                print(
+                    f"[{len(results)}/{len(runs)}] player {result.player} "
+                    f"{result.cake or f'seed {result.seed}'} n={result.children}: "
+                    f"{status} ({result.runtime:.1f}s)",
+                    file=sys.stderr,
+                )
+    return [results[i] for i in range(len(runs))]
+
+
+def write_results(results: list[RunResult], path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([field.name for field in fields(RunResult)])
+        for result in results:
+            writer.writerow(
+                ["" if value is None else value for value in asdict(result).values()]
+            )
+
+
+def summarize(results: list[RunResult]) -> str:
+    """Per-player means over the successful runs, and failure counts.
+
+    Besides the scores: the mean wall and CPU seconds of `get_cuts`, the
+    largest peak RSS and the mean shapely split/intersection/buffer calls.
+    """
+    lines = [
+        f"{'player':>6} {'runs':>5} {'failed':>6} {'size span':>10} "
+        f"{'stdev':>7} {'runtime (s)':>12} {'cuts (s)':>9} {'cuts cpu':>9} "
+        f"{'rss (MB)':>9} {'splits':>8} {'intersect':>10} {'buffers':>8}"
+    ]
+    for player in dict.fromkeys(result.player for result in results):
+        mine = [result for result in results if result.player == player]
+        ok = [result for result in mine if result.failure is None]
+
+        def average(field: str, spec: str) -> str:
+            return f"{mean(getattr(r, field) for r in ok):{spec}}" if ok else "-"
+
+        rss = [r.peak_rss_mb for r in ok if r.peak_rss_mb is not None]
+        lines.append(
+            f"{player or 'r':>6} {len(mine):>5} {len(mine) - len(ok):>6} "
+            f"{average('size_span', '.2f'):>10} {average('ratio_stdev', '.2f'):>7} "
+            f"{mean(r.runtime for r in mine):>12.1f} "
+            f"{average('cuts_time', '.2f'):>9} {average('cuts_cpu', '.2f'):>9} "
+            f"{f'{max(rss):.0f}' if rss else '-':>9} "
+            f"{average('splits', '.0f'):>8} {average('intersections', '.0f'):>10} "
+            f"{average('buffers', '.0f'):>8}"
+        )
+    return "\n".join(lines)
+
+
+def resolve_cakes(patterns: list[str]) -> list[str | None]:
+    """Cake files matching `patterns`, relative to the repository root."""
+    cakes: list[str | None] = []
+    for pattern in patterns:
+        found = sorted(glob.glob(pattern, root_dir=ROOT, recursive=True))
+        if not found:
+            raise Exception(f'no cake files match "{pattern}"')
+        cakes += found
+    return cakes
+
+
+def main():
+    parser = ArgumentParser(description="Play every combination of the options.")
+    parser.add_argument(
+        "--players",
+        "-p",
+        nargs="+",
+        default=["all"],
+        help='player ids, "r" for the random player, registered variants or "all"',
+    )
+    parser.add_argument(
+        "--cakes",
+        "-c",
+        nargs="*",
+        default=[],
+        help="cake files or glob patterns within cakes/",
+    )
+    parser.add_argument(
+        "--generated",
+        action="store_true",
+        help="also play a cake generated from each seed",
+    )
+    parser.add_argument("--seeds", "-s", nargs="+", type=int, default=[0])
+    parser.add_argument("--children", "-n", nargs="+", type=int, default=[10])
+    parser.add_argument(
+        "--workers", "-w", type=int, default=os.cpu_count() or 1, help="parallel runs"
+    )
+    parser.add_argument(
+        "--timeout", "-t", type=float, default=600, help="seconds allowed per run"
+    )
+    parser.add_argument("--output", "-o", help="write all results to this CSV file")
+    parser.add_argument("--worker", help=SUPPRESS)
+    namespace = parser.parse_args()
+
+    if namespace.worker:
+        work(Run(**json.loads(namespace.worker)))
+        return
+
+    if namespace.players == ["all"]:
+        players: list[int | str] = list(range(11))
+    else:
+        players = [sanitize_player(player) for player in namespace.players]
+    cakes = resolve_cakes(namespace.cakes)
+    if namespace.generated or not cakes:
+        cakes.append(None)
+
+    runs = plan_runs(players, cakes, namespace.seeds, namespace.children)
+    print(f"playing {len(runs)} runs on {namespace.workers} workers", file=sys.stderr)
+    results = play_all(runs, namespace.workers, namespace.timeout)
+
+    if namespace.output:
+        write_results(results, namespace.output)
+    print(summarize(results))
+
+
+if __name__ == "__main__":
+    main()